@@ -1,10 +1,18 @@
 import os
+import sys
 import json
 import logging
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 from logging.handlers import RotatingFileHandler
+from urllib.parse import quote
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 
 ###############################################################################
 # Logging Configuration
@@ -26,6 +34,9 @@ logger = logging.getLogger(__name__)
 DEFAULT_EARLIEST_DATE = "2015-01-01"
 DATE_FMT = "%Y-%m-%d"  # Standard format: 'YYYY-MM-DD'
 DMY_FMT = "%d-%m-%Y"   # Alternate format: 'DD-MM-YYYY'
+PRICE_FETCH_WORKERS = 4  # Symbols fetched concurrently (price_fetch_settings.max_workers)
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts")
+API_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs", "api_config.json")
 
 ###############################################################################
 # Subprocess / Command Helpers
@@ -166,22 +177,24 @@ def validate_config(config: Dict[str, Any]) -> None:
             logger.warning("Missing price_fetch_settings key: %s. Defaults may apply.", key)
 
 
-def dynamic_date_defaults(config: Dict[str, Any]) -> None:
+def dynamic_date_defaults(config: Dict[str, Any], now: Optional[datetime] = None) -> None:
     """
     Dynamically calculate default 'from_date' or 'to_date' if they're missing.
 
     Args:
         config (Dict[str, Any]): The configuration dictionary.
+        now (Optional[datetime]): Run-wide "current time" snapshot (defaults to datetime.now()).
     """
+    now = now or datetime.now()
     logger.info("Applying dynamic date defaults (if needed)...")
 
     if not config["price_fetch_settings"].get("from_date"):
-        one_year_ago = (datetime.now() - timedelta(days=365)).strftime(DATE_FMT)
+        one_year_ago = (now - timedelta(days=365)).strftime(DATE_FMT)
         config["price_fetch_settings"]["from_date"] = one_year_ago
         logger.info("Default from_date set to: %s", one_year_ago)
 
     if not config["price_fetch_settings"].get("to_date"):
-        today = datetime.now().strftime(DATE_FMT)
+        today = now.strftime(DATE_FMT)
         config["price_fetch_settings"]["to_date"] = today
         logger.info("Default to_date set to: %s", today)
 
@@ -223,7 +236,10 @@ def merge_json_data(existing_file: str, new_file: str) -> List[Dict[str, Any]]:
     # Deduplicate by JSON string
     combined = existing_data + new_data
     # Sort keys for consistent deduping
-    combined = list({json.dumps(entry, sort_keys=True): entry for entry in combined}.values())
+    if orjson is not None:
+        combined = list({orjson.dumps(entry, option=orjson.OPT_SORT_KEYS): entry for entry in combined}.values())
+    else:
+        combined = list({json.dumps(entry, sort_keys=True): entry for entry in combined}.values())
     return combined
 
 ###############################################################################
@@ -275,43 +291,42 @@ def run_fetch_stock_list(index_name: str, output_path: str) -> None:
 
 def run_fetch_stock_prices(symbol: str, from_date: str, to_date: str, output_path: str) -> None:
     """
-    Fetch stock prices for 'symbol' in 'from_date'..'to_date' range,
+    Fetch stock prices for 'symbol' in 'from_date'..'to_date' range ('DD-MM-YYYY'),
     merging new data with existing data at 'output_path'.
+
+    The fetch runs in-process through utils.api_helpers, so concurrent calls from
+    fetch_stock_prices_step share one HTTP session, cookie warm-up and pacing.
     """
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    from utils.api_helpers import load_api_config, fetch_historical_security_archives, save_json_to_file
+
     logger.info("Fetching prices for %s from %s to %s", symbol, from_date, to_date)
 
     # We'll fetch data into a temporary JSON file, then merge it.
     temp_output_path = f"{output_path}.tmp"
-    description = f"Fetch stock prices for {symbol}"
-
-    command = [
-        "python", "scripts/fetch_stock_prices.py",
-        "--symbol", symbol,
-        "--output", temp_output_path
-    ]
-    if from_date:
-        command += ["--from_date", from_date]
-    if to_date:
-        command += ["--to_date", to_date]
 
-    # Run the external script
-    try:
-        run_command(command, description)
-    except subprocess.CalledProcessError:
-        # Already logged by run_command, just return
+    api_config = load_api_config(API_CONFIG_PATH)
+    # Encode the symbol to handle special characters
+    data = fetch_historical_security_archives(api_config, quote(symbol), from_date or None, to_date or None)
+    if not data:
+        logger.warning("No data fetched for %s. Skipping merge.", symbol)
         return
 
-    # Check if the temporary file was created
-    if not os.path.exists(temp_output_path):
-        logger.warning("No data file created for %s. Skipping merge.", symbol)
-        return
+    os.makedirs(os.path.dirname(temp_output_path) or ".", exist_ok=True)
+    save_json_to_file(data, temp_output_path)
 
     # Merge new data into existing data
     combined_data = merge_json_data(output_path, temp_output_path)
 
-    # Save merged data
-    with open(output_path, 'w', encoding='utf-8') as of:
-        json.dump(combined_data, of, indent=4)
+    # Save merged data. orjson's 2-space indent still writes '"CH_TIMESTAMP": "...',
+    # one of the layouts populate_stock_metadata.py --trust-format scans for
+    if orjson is not None:
+        with open(output_path, 'wb') as of:
+            of.write(orjson.dumps(combined_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as of:
+            json.dump(combined_data, of, indent=4)
     logger.info("Merged & updated stock prices saved to %s", output_path)
 
     # Clean up temp file
@@ -344,13 +359,31 @@ def run_populate_stock_metadata(config_file: str, metadata_file: str) -> None:
     run_command(command, description)
 
 
-def run_db_ingest() -> None:
+def run_db_ingest(config: Dict[str, Any]) -> None:
     """
-    Insert the latest data into the database.
+    Insert the latest data into the database, reusing the already-parsed config
+    instead of having the ingest script re-read 'config.json'.
+
+    The ingest runs in this process, so its records go to this pipeline's log;
+    they are also written to 'db_ingest.log', as when it ran as a separate script.
     """
-    description = "DB ingestion"
-    command = ["python", "scripts/data_ingest.py"]
-    run_command(command, description)
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    from data_ingest import run_ingest
+
+    ingest_logger = logging.getLogger("data_ingest")
+    file_handler = RotatingFileHandler("db_ingest.log", maxBytes=5 * 1024 * 1024, backupCount=3)
+    file_handler.setFormatter(logging.Formatter(
+        "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    ))
+    ingest_logger.addHandler(file_handler)
+    try:
+        logger.info("Executing: DB ingestion")
+        run_ingest(config)
+    finally:
+        ingest_logger.removeHandler(file_handler)
+        file_handler.close()
 
 ###############################################################################
 # Chunked Fetch Logic
@@ -398,7 +431,11 @@ def fetch_stock_list_step(config: Dict[str, Any]) -> str:
     return output_path
 
 
-def fetch_stock_prices_step(stock_names: List[str], config: Dict[str, Any]) -> None:
+def fetch_stock_prices_step(
+    stock_names: List[str],
+    config: Dict[str, Any],
+    now: Optional[datetime] = None
+) -> None:
     """
     Intelligently fetch historical stock prices by identifying and downloading only missing data chunks.
     
@@ -412,8 +449,10 @@ def fetch_stock_prices_step(stock_names: List[str], config: Dict[str, Any]) -> N
         stock_names: List of stock symbols to fetch data for
         config: Configuration dictionary containing:
             - price_fetch_settings: Dictionary with optional 'from_date' and 'to_date' 
-              in 'YYYY-MM-DD' format
+              in 'YYYY-MM-DD' format, and 'max_workers' (number of symbols fetched
+              concurrently, default PRICE_FETCH_WORKERS)
             - output_paths: Dictionary with 'stock_prices' template containing {symbol} placeholder
+        now: Run-wide "current time" snapshot (defaults to datetime.now())
     
     Returns:
         None: Results are saved to disk at paths specified in config
@@ -438,7 +477,7 @@ def fetch_stock_prices_step(stock_names: List[str], config: Dict[str, Any]) -> N
         raise ValueError("config must contain 'output_paths' with 'stock_prices' template")
     
     logger.info("Fetching stock prices for %d symbols...", len(stock_names))
-    today = datetime.now()
+    today = now or datetime.now()
     
     # Parse date ranges from config with validation
     try:
@@ -462,84 +501,32 @@ def fetch_stock_prices_step(stock_names: List[str], config: Dict[str, Any]) -> N
         logger.error("Failed to load metadata from %s: %s", metadata_file_path, str(e))
         metadata_dict = {}
     
+    workers = price_settings.get("max_workers", PRICE_FETCH_WORKERS)
+    stock_prices_template = output_paths["stock_prices"]
     processed_count = 0
     error_count = 0
     
-    for symbol in stock_names:
-        try:
-            # Normalize symbol case
-            normalized_symbol = symbol.upper()
-            
-            # Build output path for each symbol
-            stock_prices_template = output_paths["stock_prices"]
-            output_path = stock_prices_template.format(symbol=normalized_symbol).lower()
-            
-            # Extract metadata for this symbol
-            md_entry = metadata_dict.get(normalized_symbol, {})
-            
-            # Determine effective date range accounting for listing date
-            listing_date = get_date_or_default(md_entry.get("listing_date", ""), DEFAULT_EARLIEST_DATE)
-            effective_start = max(from_date, listing_date)
-            effective_end = min(to_date, today)
-            
-            if effective_start > effective_end:
-                logger.info(
-                    "No valid date range for %s: listing_date=%s, requested range=[%s, %s]",
-                    normalized_symbol, 
-                    listing_date.strftime(DATE_FMT),
-                    from_date.strftime(DATE_FMT), 
-                    to_date.strftime(DATE_FMT)
-                )
-                continue
-            
-            # Parse existing data ranges
-            fetched_start = None
-            fetched_end = None
-            if md_entry:
-                try:
-                    if md_entry.get("start_date"):
-                        fetched_start = datetime.strptime(md_entry["start_date"], DATE_FMT)
-                    if md_entry.get("end_date"):
-                        fetched_end = datetime.strptime(md_entry["end_date"], DATE_FMT)
-                except ValueError as e:
-                    logger.warning(
-                        "Invalid date format in metadata for %s: %s. Treating as no data.",
-                        normalized_symbol, str(e)
-                    )
-            
-            # Calculate date ranges that need to be fetched
-            ranges_to_fetch = calculate_missing_ranges(
-                effective_start, effective_end, fetched_start, fetched_end
-            )
-            
-            if not ranges_to_fetch:
-                logger.info(
-                    "Data for %s is already up to date (range %s to %s)",
-                    normalized_symbol,
-                    effective_start.strftime(DATE_FMT),
-                    effective_end.strftime(DATE_FMT)
-                )
-                continue
-            
-            # Fetch each missing range
-            for start, end in ranges_to_fetch:
-                logger.info(
-                    "Fetching %s: %s to %s", 
-                    normalized_symbol, 
-                    start.strftime(DATE_FMT), 
-                    end.strftime(DATE_FMT)
+    # Symbols are independent (one output file each), so their fetches overlap on
+    # a small thread pool; the date chunks of one symbol stay sequential
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                fetch_symbol_prices,
+                symbol, from_date, to_date, today, metadata_dict, stock_prices_template
+            ): symbol
+            for symbol in stock_names
+        }
+        for future in as_completed(futures):
+            try:
+                if future.result():
+                    processed_count += 1
+            except Exception as e:
+                logger.error(
+                    "Error processing %s: %s", 
+                    futures[future], str(e), 
+                    exc_info=True
                 )
-                fetch_stock_prices_by_dates(normalized_symbol, start, end, output_path)
-            
-            processed_count += 1
-            
-        except Exception as e:
-            logger.error(
-                "Error processing %s: %s", 
-                symbol, str(e), 
-                exc_info=True
-            )
-            error_count += 1
+                error_count += 1
     
     logger.info(
         "Completed fetching stock prices. Successfully processed: %d, Errors: %d", 
@@ -547,6 +534,94 @@ def fetch_stock_prices_step(stock_names: List[str], config: Dict[str, Any]) -> N
     )
 
 
+def fetch_symbol_prices(
+    symbol: str,
+    from_date: datetime,
+    to_date: datetime,
+    today: datetime,
+    metadata_dict: Dict[str, Dict[str, Any]],
+    stock_prices_template: str
+) -> bool:
+    """
+    Fetch the missing date ranges of one symbol's prices (see fetch_stock_prices_step).
+
+    Args:
+        symbol: Stock symbol to fetch data for
+        from_date: Requested start date
+        to_date: Requested end date
+        today: Run-wide "current time" snapshot
+        metadata_dict: Symbol metadata keyed by upper-case symbol
+        stock_prices_template: Output path template containing {symbol}
+
+    Returns:
+        True if prices were fetched, False if the symbol had nothing to fetch
+    """
+    # Normalize symbol case
+    normalized_symbol = symbol.upper()
+    
+    # Build output path for the symbol
+    output_path = stock_prices_template.format(symbol=normalized_symbol).lower()
+    
+    # Extract metadata for this symbol
+    md_entry = metadata_dict.get(normalized_symbol, {})
+    
+    # Determine effective date range accounting for listing date
+    listing_date = get_date_or_default(md_entry.get("listing_date", ""), DEFAULT_EARLIEST_DATE)
+    effective_start = max(from_date, listing_date)
+    effective_end = min(to_date, today)
+    
+    if effective_start > effective_end:
+        logger.info(
+            "No valid date range for %s: listing_date=%s, requested range=[%s, %s]",
+            normalized_symbol, 
+            listing_date.strftime(DATE_FMT),
+            from_date.strftime(DATE_FMT), 
+            to_date.strftime(DATE_FMT)
+        )
+        return False
+    
+    # Parse existing data ranges
+    fetched_start = None
+    fetched_end = None
+    if md_entry:
+        try:
+            if md_entry.get("start_date"):
+                fetched_start = datetime.strptime(md_entry["start_date"], DATE_FMT)
+            if md_entry.get("end_date"):
+                fetched_end = datetime.strptime(md_entry["end_date"], DATE_FMT)
+        except ValueError as e:
+            logger.warning(
+                "Invalid date format in metadata for %s: %s. Treating as no data.",
+                normalized_symbol, str(e)
+            )
+    
+    # Calculate date ranges that need to be fetched
+    ranges_to_fetch = calculate_missing_ranges(
+        effective_start, effective_end, fetched_start, fetched_end
+    )
+    
+    if not ranges_to_fetch:
+        logger.info(
+            "Data for %s is already up to date (range %s to %s)",
+            normalized_symbol,
+            effective_start.strftime(DATE_FMT),
+            effective_end.strftime(DATE_FMT)
+        )
+        return False
+    
+    # Fetch each missing range
+    for start, end in ranges_to_fetch:
+        logger.info(
+            "Fetching %s: %s to %s", 
+            normalized_symbol, 
+            start.strftime(DATE_FMT), 
+            end.strftime(DATE_FMT)
+        )
+        fetch_stock_prices_by_dates(normalized_symbol, start, end, output_path)
+    
+    return True
+
+
 def calculate_missing_ranges(
     effective_start: datetime, 
     effective_end: datetime, 
@@ -603,7 +678,9 @@ def main() -> None:
     config_path = "config.json"
     config = load_config(config_path)
     validate_config(config)
-    dynamic_date_defaults(config)
+    # Take one "now" for the whole run so every step agrees on today's date
+    now = datetime.now()
+    dynamic_date_defaults(config, now)
 
     # Step 1: Fetch stock list
     stock_list_path = fetch_stock_list_step(config)
@@ -625,7 +702,7 @@ def main() -> None:
     logger.info("Saved %d symbols to %s", len(stock_names), stock_names_path)
 
     # Step 3: Fetch prices for each symbol
-    fetch_stock_prices_step(stock_names, config)
+    fetch_stock_prices_step(stock_names, config, now)
 
     # Step 4: Transform the fetched stock list
     run_transform_stock_list(stock_list_path)
@@ -635,7 +712,7 @@ def main() -> None:
     run_populate_stock_metadata(config_path, metadata_file_path)
 
     # Step 6: DB Ingestion
-    run_db_ingest()
+    run_db_ingest(config)
     logger.info("Data ingestion pipeline completed successfully.")
 
 if __name__ == "__main__":
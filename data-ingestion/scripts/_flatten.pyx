@@ -0,0 +1,30 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled version of transform_stock_list.flatten_stock_item.
+
+Build in place with:
+    python setup_flatten.py build_ext --inplace
+
+transform_stock_list falls back to its pure Python implementation when this
+module has not been built.
+"""
+
+cdef str META_PREFIX = "meta_"
+
+
+cpdef dict flatten_stock_item(dict item):
+    """
+    Flatten a single stock item, moving 'meta' sub-keys up as 'meta_<key>'.
+    Same behaviour as the Python version in transform_stock_list.
+    """
+    cdef dict flattened
+    cdef object meta = item.get('meta')
+    if type(meta) is not dict:
+        return dict(item)
+    flattened = {}
+    for key, value in item.items():
+        if key != 'meta':
+            flattened[key] = value
+    for mkey, mval in (<dict>meta).items():
+        flattened[META_PREFIX + mkey] = mval
+    return flattened
@@ -1,26 +1,70 @@
+import io
 import os
+import argparse
+import csv
 import json
+import mmap
+import queue
+import atexit
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
 import psycopg2
-import psycopg2.extras
-from logging.handlers import RotatingFileHandler
-from datetime import datetime
-from utils.db_helpers import get_db_connection
+import psycopg2.pool
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from datetime import date, datetime
+from utils.db_helpers import get_db_connection, get_db_pool
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to loading the whole file
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:  # fastjsonschema is optional; price records are then only checked by price_row
+    fastjsonschema = None
+
 ###############################################################################
 # Logging Configuration
 ###############################################################################
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    handlers=[
-        RotatingFileHandler("db_ingest.log", maxBytes=5 * 1024 * 1024, backupCount=3),
-        logging.StreamHandler()
-    ]
-)
+def configure_logging(log_file: str = "db_ingest.log") -> QueueListener:
+    """
+    Route log records through a queue so the ingest loop never blocks on log I/O.
+
+    The root logger only gets a QueueHandler; a QueueListener thread owns the
+    rotating file and console handlers and is stopped at interpreter exit.
+
+    Returns: The started QueueListener.
+    """
+    formatter = logging.Formatter(
+        "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+    file_handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=3)
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
 logger = logging.getLogger(__name__)
 
 ###############################################################################
@@ -30,12 +74,132 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Directory of this scrip
 CONFIG_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "configs"))
 DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))
 
+# Raw price-record keys (besides the mapped columns) worth keeping in 'meta_data'
+PRICE_META_KEYS = ("CH_SERIES", "CH_MARKET_TYPE", "CH_ISIN")
+
+# 'stock_prices' columns filled from a raw price record, in price_row order
+PRICE_COLUMNS = (
+    "symbol", "trade_date", "high_price", "low_price", "open_price", "close_price",
+    "last_traded_price", "previous_close_price", "total_traded_qty", "total_traded_value",
+    "high_52week", "low_52week", "total_trades", "delivery_qty", "delivery_perc", "vwap",
+    "meta_data",
+)
+
+# Shape of a raw price record that can be stored: 'stock_prices' needs a trade
+# date, and the symbol may be missing (stored as NULL). Numeric fields are not
+# constrained: price_row stores values sanitize_float/sanitize_numeric can't
+# convert as NULL rather than dropping the row.
+# The CH_TIMESTAMP pattern accepts what strptime's "%Y-%m-%d" does in
+# parse_trade_date, including non-zero-padded months and days; impossible dates
+# such as 2024-02-30 are left for parse_trade_date to reject
+PRICE_RECORD_SCHEMA = {
+    "type": "object",
+    "required": ["CH_TIMESTAMP"],
+    "properties": {
+        "CH_SYMBOL": {"type": ["string", "null"]},
+        "CH_TIMESTAMP": {
+            "type": "string",
+            "pattern": "^[0-9]{4}-(1[0-2]|0[1-9]|[1-9])-(3[01]|[12][0-9]|0[1-9]|[1-9]| [1-9])$",
+        },
+    },
+}
+
+# Compiled once into a plain Python function
+validate_price_record = fastjsonschema.compile(PRICE_RECORD_SCHEMA) if fastjsonschema is not None else None
+
+# Session-lived staging table that price rows are COPYed into before the merge;
+# it is emptied at every commit. row_no keeps the file order so the last
+# duplicate of a trade_date wins
+CREATE_PRICE_STAGING_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS stock_prices_staging (
+    row_no INT NOT NULL,
+    symbol VARCHAR(50),
+    trade_date DATE NOT NULL,
+    high_price NUMERIC,
+    low_price NUMERIC,
+    open_price NUMERIC,
+    close_price NUMERIC,
+    last_traded_price NUMERIC,
+    previous_close_price NUMERIC,
+    total_traded_qty BIGINT,
+    total_traded_value NUMERIC,
+    high_52week NUMERIC,
+    low_52week NUMERIC,
+    total_trades INT,
+    delivery_qty BIGINT,
+    delivery_perc NUMERIC,
+    vwap NUMERIC,
+    meta_data JSONB
+) ON COMMIT DELETE ROWS;
+"""
+
+# Price rows are buffered and COPYed into the staging table this many at a time
+COPY_CHUNK_ROWS = 10_000
+
+COPY_PRICE_STAGING_SQL = (
+    f"COPY stock_prices_staging (row_no, {', '.join(PRICE_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv, NULL '')"
+)
+
+# Rows whose values are unchanged are left alone, so re-ingesting an archive
+# doesn't rewrite every row (and its index entries) in 'stock_prices'
+_MERGE_PRICE_STAGING = f"""
+INSERT INTO stock_prices (stock_id, {', '.join(PRICE_COLUMNS)})
+SELECT DISTINCT ON (trade_date) {{stock_id}}, {', '.join(PRICE_COLUMNS)}
+FROM stock_prices_staging
+ORDER BY trade_date, row_no DESC
+ON CONFLICT (stock_id, trade_date)
+DO UPDATE SET
+    {', '.join(f"{column} = EXCLUDED.{column}" for column in PRICE_COLUMNS if column != "trade_date")},
+    updated_at = NOW()
+WHERE ({', '.join(f"stock_prices.{column}" for column in PRICE_COLUMNS if column != "trade_date")})
+    IS DISTINCT FROM ({', '.join(f"EXCLUDED.{column}" for column in PRICE_COLUMNS if column != "trade_date")});
+"""
+
+MERGE_PRICE_STAGING_SQL = _MERGE_PRICE_STAGING.format(stock_id="%s")
+
+# The merge is planned once per session and executed per symbol
+PREPARE_PRICE_MERGE_SQL = (
+    "PREPARE merge_stock_prices (INT) AS " + _MERGE_PRICE_STAGING.format(stock_id="$1")
+)
+EXECUTE_PRICE_MERGE_SQL = "EXECUTE merge_stock_prices (%s)"
+DEALLOCATE_PRICE_MERGE_SQL = "DEALLOCATE merge_stock_prices"
+
+# Price commits don't wait for the WAL flush. A crash can lose the last few
+# hundred ms of commits, but the archives are re-ingested idempotently (the
+# merge is an upsert), so a re-run recovers them
+ASYNC_COMMIT_SQL = "SET LOCAL synchronous_commit = OFF"
+
+
+# Price files are ingested by up to this many threads, each on its own pooled connection
+PRICE_INGEST_WORKERS = 8
+
+# Files at least this large are mapped rather than read into a bytes copy
+MMAP_MIN_BYTES = 1024 * 1024
+
 
 def normalize_path(path: str) -> str:
     """Convert a file path to a consistent format with forward slashes."""
     return Path(path).as_posix()
 
 
+def load_json_file(path: str) -> Any:
+    """
+    Parse a JSON file, with orjson over the raw bytes when it is installed.
+    Files of MMAP_MIN_BYTES or more are parsed straight from a read-only mmap.
+    """
+    if orjson is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
 ###############################################################################
 # Database Helpers
 ###############################################################################
@@ -107,12 +271,10 @@ def ensure_tables_exist(conn: psycopg2.extensions.connection) -> None:
 # Insert / Upsert Logic
 ###############################################################################
 
-def upsert_stock(conn: psycopg2.extensions.connection, stock_item: Dict[str, Any]) -> int:
+def stock_row(stock_item: Dict[str, Any]) -> Tuple[Any, ...]:
     """
-    Insert or update (ON CONFLICT) a stock in the 'stocks' table based on 'symbol'.
-    If 'symbol' exists, fields are updated. Otherwise, a new row is created.
-
-    Returns: The 'id' (primary key) of the row in 'stocks'.
+    Map a flattened stock record to the (symbol, company_name, industry, isin, meta_data)
+    values of a 'stocks' row; every other field goes into 'meta_data'.
     """
     data = dict(stock_item)
     symbol = data.pop("symbol", None)
@@ -120,14 +282,34 @@ def upsert_stock(conn: psycopg2.extensions.connection, stock_item: Dict[str, Any
     industry = data.pop("meta_industry", None)
     isin = data.pop("meta_isin", None)
 
-    meta_data_json = psycopg2.extras.Json(data, dumps=json.dumps)
+    return symbol, company_name, industry, isin, json.dumps(data)
+
+def upsert_stocks(conn: psycopg2.extensions.connection, stock_items: Iterable[Dict[str, Any]]) -> List[Tuple[str, int]]:
+    """
+    Insert or update (ON CONFLICT) stocks in the 'stocks' table based on 'symbol',
+    in a single statement: each column is sent as one array parameter and unnested
+    server-side, rather than binding every value of every row separately.
+    If a symbol appears more than once, its last record wins. Commits once.
+
+    Returns: (symbol, id) for every upserted row in 'stocks'.
+    """
+    # One row per symbol: a single INSERT ... ON CONFLICT DO UPDATE can't touch a row twice
+    rows = {}
+    for item in stock_items:
+        row = stock_row(item)
+        rows[row[0]] = row
+    if not rows:
+        return []
+
+    # Lists, not tuples: psycopg2 adapts lists to ARRAYs
+    columns = [list(column) for column in zip(*rows.values())]
 
     with conn.cursor() as cur:
         sql = """
         INSERT INTO stocks (
             symbol, company_name, industry, isin, meta_data
         )
-        VALUES (%s, %s, %s, %s, %s)
+        SELECT * FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[], %s::jsonb[])
         ON CONFLICT (symbol)
         DO UPDATE SET
             company_name = EXCLUDED.company_name,
@@ -135,112 +317,198 @@ def upsert_stock(conn: psycopg2.extensions.connection, stock_item: Dict[str, Any
             isin = EXCLUDED.isin,
             meta_data = EXCLUDED.meta_data,
             updated_at = NOW()
-        RETURNING id;
+        RETURNING symbol, id;
         """
-        cur.execute(sql, (symbol, company_name, industry, isin, meta_data_json))
-        stock_id = cur.fetchone()[0]
+        cur.execute(sql, columns)
+        ids = cur.fetchall()
     conn.commit()
-    return stock_id
+    return ids
 
-def upsert_stock_price(
-    conn: psycopg2.extensions.connection,
-    stock_id: int,
-    price_item: Dict[str, Any]
-) -> int:
+def sanitize_numeric(value, default=None):
+    """Convert value to integer or return default."""
+    if value is None:
+        return default
+    if isinstance(value, int):  # Already an integer
+        return value
+    if isinstance(value, str) and value.isdigit():  # String containing a valid integer
+        return int(value)
+    return default
+
+
+def sanitize_float(value, default=None):
+    """Convert value to float or return default."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def parse_trade_date(value: str) -> Optional[date]:
     """
-    Insert or update (ON CONFLICT) a single price row into 'stock_prices' based on (stock_id, trade_date).
-    This ensures if the same date is inserted again, we update instead of inserting a duplicate.
+    Parse a 'YYYY-MM-DD' CH_TIMESTAMP, or return None if it isn't one.
 
-    Returns: The new or updated row's 'id'.
+    Zero-padded dates (everything NSE sends) take the C date.fromisoformat path,
+    roughly 10x cheaper than strptime; strptime still decides everything else.
     """
-    data = dict(price_item)
+    if len(value) == 10 and value[4] == "-" and value[7] == "-" and value.isascii():
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
 
-    # Symbol can be stored in prices for convenience; might come from CH_SYMBOL
-    symbol = data.pop("CH_SYMBOL", None)
+
+def price_row(price_item: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """
+    Map a raw price record to the PRICE_COLUMNS values of a 'stock_prices' row.
+
+    Only the keys in PRICE_META_KEYS are kept in 'meta_data'; the rest of the raw
+    record (Mongo ids, createdAt/updatedAt, ...) is dropped instead of being
+    copied, re-encoded and stored per row.
+
+    Returns: The row values, or None if the record has no valid CH_TIMESTAMP
+    (trade_date is NOT NULL, so such a record can't be stored).
+    """
+    get = price_item.get
 
     # Convert date
-    trade_date_str = data.pop("CH_TIMESTAMP", None)
-    trade_date = None
-    if trade_date_str:
-        try:
-            trade_date = datetime.strptime(trade_date_str, "%Y-%m-%d").date()
-        except ValueError:
-            logger.warning("Invalid CH_TIMESTAMP '%s' for stock_id=%d", trade_date_str, stock_id)
-
-    def sanitize_numeric(value, default=None):
-        """Convert value to integer or return default."""
-        if value is None:
-            return default
-        if isinstance(value, int):  # Already an integer
-            return value
-        if isinstance(value, str) and value.isdigit():  # String containing a valid integer
-            return int(value)
-        return default
+    trade_date_str = get("CH_TIMESTAMP")
+    if not trade_date_str:
+        return None
+    trade_date = parse_trade_date(trade_date_str)
+    if trade_date is None:
+        return None
+
+    meta_data = {key: price_item[key] for key in PRICE_META_KEYS if key in price_item}
+
+    return (
+        # Symbol can be stored in prices for convenience; might come from CH_SYMBOL
+        get("CH_SYMBOL"),
+        trade_date.isoformat(),
+        sanitize_float(get("CH_TRADE_HIGH_PRICE")),
+        sanitize_float(get("CH_TRADE_LOW_PRICE")),
+        sanitize_float(get("CH_OPENING_PRICE")),
+        sanitize_float(get("CH_CLOSING_PRICE")),
+        sanitize_float(get("CH_LAST_TRADED_PRICE")),
+        sanitize_float(get("CH_PREVIOUS_CLS_PRICE")),
+        sanitize_numeric(get("CH_TOT_TRADED_QTY")),
+        sanitize_float(get("CH_TOT_TRADED_VAL")),
+        sanitize_float(get("CH_52WEEK_HIGH_PRICE")),
+        sanitize_float(get("CH_52WEEK_LOW_PRICE")),
+        sanitize_numeric(get("CH_TOTAL_TRADES")),
+        sanitize_numeric(get("COP_DELIV_QTY")),
+        sanitize_float(get("COP_DELIV_PERC")),
+        sanitize_float(get("VWAP")),
+        json.dumps(meta_data),
+    )
+
+
+def iter_price_items(prices_file: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the price records in a price file: the items under 'data', the items of
+    a top-level list, or a single top-level record.
+    With ijson the file is stream-parsed, so only one record is in memory at a time.
+    """
+    if ijson is not None:
+        with open(prices_file, 'rb') as f:
+            prefix = "item" if f.read(64).lstrip().startswith(b"[") else "data.item"
+            f.seek(0)
+            found = False
+            # use_float so numbers come back as float rather than Decimal, as with json.load
+            for price_item in ijson.items(f, prefix, use_float=True):
+                found = True
+                yield price_item
+        if found or prefix == "item":
+            return
+
+    # No ijson, or an object without a 'data' list (a single record)
+    data = load_json_file(prices_file)
+    if isinstance(data, dict) and "data" in data:
+        data = data["data"]
+    elif isinstance(data, dict):
+        data = [data]
+    yield from data
+
+
+def _copy_chunk(cur, buf: io.StringIO) -> None:
+    """COPY the CSV rows in buf into the staging table and empty buf."""
+    buf.seek(0)
+    cur.copy_expert(COPY_PRICE_STAGING_SQL, buf)
+    buf.seek(0)
+    buf.truncate()
+
+
+@contextmanager
+def prepared_price_merge(conn: psycopg2.extensions.connection) -> Iterator[None]:
+    """
+    Create the price staging table and PREPARE the merge once for this session,
+    for copy_stock_prices(..., prepared=True) calls inside the block.
+    The prepared statement is deallocated on exit, including on errors; a failed
+    cleanup is only logged, so it never masks the error that ended the block.
+    """
+    with conn.cursor() as cur:
+        cur.execute(CREATE_PRICE_STAGING_SQL)
+        cur.execute(PREPARE_PRICE_MERGE_SQL)
+    conn.commit()
+    try:
+        yield
+    finally:
+        if not conn.closed:
+            try:
+                conn.rollback()  # Leave any failed transaction before deallocating
+                with conn.cursor() as cur:
+                    cur.execute(DEALLOCATE_PRICE_MERGE_SQL)
+                conn.commit()
+            except psycopg2.Error as e:
+                logger.warning("Could not deallocate the prepared price merge: %s", e)
+
+
+def copy_stock_prices(
+    conn: psycopg2.extensions.connection,
+    stock_id: int,
+    rows: Iterable[Tuple[Any, ...]],
+    prepared: bool = False
+) -> int:
+    """
+    Bulk upsert price rows (see price_row) for one stock into 'stock_prices'.
 
+    The rows are streamed with COPY into a temporary staging table and merged with
+    a single INSERT ... ON CONFLICT (stock_id, trade_date) DO UPDATE, instead of
+    one statement and round trip per row. If the same trade_date appears more than
+    once, the last row wins, as it did with per-row upserts. Commits once.
 
-    def sanitize_float(value, default=None):
-        """Convert value to float or return default."""
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return default
-
-    # Sanitize numeric fields
-    high_price = sanitize_float(data.pop("CH_TRADE_HIGH_PRICE", None))
-    low_price = sanitize_float(data.pop("CH_TRADE_LOW_PRICE", None))
-    open_price = sanitize_float(data.pop("CH_OPENING_PRICE", None))
-    close_price = sanitize_float(data.pop("CH_CLOSING_PRICE", None))
-    last_traded_price = sanitize_float(data.pop("CH_LAST_TRADED_PRICE", None))
-    previous_close_price = sanitize_float(data.pop("CH_PREVIOUS_CLS_PRICE", None))
-    total_traded_qty = sanitize_numeric(data.pop("CH_TOT_TRADED_QTY", None))
-    total_traded_value = sanitize_float(data.pop("CH_TOT_TRADED_VAL", None))
-    high_52week = sanitize_float(data.pop("CH_52WEEK_HIGH_PRICE", None))
-    low_52week = sanitize_float(data.pop("CH_52WEEK_LOW_PRICE", None))
-    total_trades = sanitize_numeric(data.pop("CH_TOTAL_TRADES", None))
-    delivery_qty = sanitize_numeric(data.pop("COP_DELIV_QTY", None))
-    delivery_perc = sanitize_float(data.pop("COP_DELIV_PERC", None))
-    vwap = sanitize_float(data.pop("VWAP", None))
-
-    meta_data_json = psycopg2.extras.Json(data, dumps=json.dumps)
+    rows may be a generator; it is consumed and COPYed COPY_CHUNK_ROWS rows at a
+    time, so the CSV buffer stays small however long the price history is.
+
+    With prepared=True (inside prepared_price_merge) the staging table already
+    exists and the merge runs as the prepared statement. The transaction commits
+    with synchronous_commit off (see ASYNC_COMMIT_SQL).
+
+    Returns: The number of rows inserted or changed.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
 
     with conn.cursor() as cur:
-        sql = """
-        INSERT INTO stock_prices (
-            stock_id, symbol, trade_date, high_price, low_price, open_price, close_price,
-            last_traded_price, previous_close_price, total_traded_qty, total_traded_value,
-            high_52week, low_52week, total_trades, delivery_qty, delivery_perc, vwap, meta_data
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (stock_id, trade_date)
-        DO UPDATE SET
-            symbol = EXCLUDED.symbol,
-            high_price = EXCLUDED.high_price,
-            low_price = EXCLUDED.low_price,
-            open_price = EXCLUDED.open_price,
-            close_price = EXCLUDED.close_price,
-            last_traded_price = EXCLUDED.last_traded_price,
-            previous_close_price = EXCLUDED.previous_close_price,
-            total_traded_qty = EXCLUDED.total_traded_qty,
-            total_traded_value = EXCLUDED.total_traded_value,
-            high_52week = EXCLUDED.high_52week,
-            low_52week = EXCLUDED.low_52week,
-            total_trades = EXCLUDED.total_trades,
-            delivery_qty = EXCLUDED.delivery_qty,
-            delivery_perc = EXCLUDED.delivery_perc,
-            vwap = EXCLUDED.vwap,
-            meta_data = EXCLUDED.meta_data,
-            updated_at = NOW()
-        RETURNING id;
-        """
-        cur.execute(sql, (
-            stock_id, symbol, trade_date, high_price, low_price, open_price, close_price,
-            last_traded_price, previous_close_price, total_traded_qty, total_traded_value,
-            high_52week, low_52week, total_trades, delivery_qty, delivery_perc, vwap,
-            meta_data_json
-        ))
-        row_id = cur.fetchone()[0]
+        cur.execute(ASYNC_COMMIT_SQL)
+        if not prepared:
+            cur.execute(CREATE_PRICE_STAGING_SQL)
+        pending = 0
+        for row_no, row in enumerate(rows):
+            writer.writerow((row_no,) + row)
+            pending += 1
+            if pending == COPY_CHUNK_ROWS:
+                _copy_chunk(cur, buf)
+                pending = 0
+        if pending:
+            _copy_chunk(cur, buf)
+        cur.execute(EXECUTE_PRICE_MERGE_SQL if prepared else MERGE_PRICE_STAGING_SQL, (stock_id,))
+        merged = cur.rowcount
     conn.commit()
-    return row_id
+    return merged
 
 ###############################################################################
 # Example: Ingesting Stocks and Prices
@@ -254,50 +522,116 @@ def ingest_stocks(conn: psycopg2.extensions.connection, transformed_file: str) -
         logger.error("Transformed file not found at %s", transformed_file)
         return
 
-    with open(transformed_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        records = data.get("data", []) if isinstance(data, dict) else data
+    data = load_json_file(transformed_file)
+    records = data.get("data", []) if isinstance(data, dict) else data
 
     # Filter records with priority = 0
     priority_zero_records = [record for record in records if record.get("priority", -1) == 0]
     logger.info("Found %d records with priority=0 from %s", len(priority_zero_records), transformed_file)
 
-    for item in priority_zero_records:
-        stock_id = upsert_stock(conn, item)
-        logger.debug("Upserted stock symbol=%s => id=%d", item.get("symbol"), stock_id)
+    ids = upsert_stocks(conn, priority_zero_records)
+    if logger.isEnabledFor(logging.DEBUG):
+        for symbol, stock_id in ids:
+            logger.debug("Upserted stock symbol=%s => id=%d", symbol, stock_id)
     logger.info("Done ingesting stocks into DB from %s", transformed_file)
 
+def ingested_trade_dates(conn: psycopg2.extensions.connection, stock_id: int) -> Set[str]:
+    """
+    Return the 'YYYY-MM-DD' trade dates already in 'stock_prices' for stock_id,
+    minus the latest one, which may still be revised (see ingest_prices_for_symbol).
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT trade_date FROM stock_prices WHERE stock_id = %s", (stock_id,))
+        dates = {trade_date.isoformat() for (trade_date,) in cur}
+    if dates:
+        dates.remove(max(dates))
+    return dates
+
+
 def ingest_prices_for_symbol(
     conn: psycopg2.extensions.connection,
     stock_id: int,
     symbol: str,
-    prices_file: str
+    prices_file: str,
+    prepared: bool = False,
+    skip_ingested_dates: bool = False
 ) -> None:
     """
-    Reads the 'prices_file' JSON for a given symbol, upserting each record into 'stock_prices'.
+    Streams the 'prices_file' JSON for a given symbol and upserts its records into 'stock_prices'
+    in one COPY + merge (see copy_stock_prices for prepared).
+
+    With skip_ingested_dates, records for days already stored (except the latest)
+    are dropped before the COPY, so an incremental re-run only sends new days;
+    revisions to older stored days are then not written.
     """
     prices_file = normalize_path(prices_file)  # Normalize path for logging
     if not os.path.exists(prices_file):
         logger.warning(f"No price file found for symbol={symbol} at path={prices_file}")
         return
 
-    with open(prices_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        if isinstance(data, dict) and "data" in data:
-            data = data["data"]
-        elif isinstance(data, dict):
-            data = [data]
-
-    logger.info(f"Ingesting {len(data)} price rows for symbol={symbol} (stock_id={stock_id}) from file={prices_file}.")
-    for price_item in data:
-        _pid = upsert_stock_price(conn, stock_id, price_item)
-    logger.info(f"Done ingesting price data for {symbol} from file={prices_file}.")
+    logger.info("Ingesting price rows for symbol=%s (stock_id=%d) from file=%s.", symbol, stock_id, prices_file)
+    skip_dates = ingested_trade_dates(conn, stock_id) if skip_ingested_dates else set()
+    read = skipped = invalid = 0
+
+    def valid_rows() -> Iterator[Tuple[Any, ...]]:
+        nonlocal read, skipped, invalid
+        for price_item in iter_price_items(prices_file):
+            read += 1
+            if validate_price_record is not None:
+                try:
+                    validate_price_record(price_item)
+                except fastjsonschema.JsonSchemaException as e:
+                    logger.warning("Invalid price record for stock_id=%d (%s); skipping row", stock_id, e.message)
+                    invalid += 1
+                    continue
+            if skip_dates and price_item.get("CH_TIMESTAMP") in skip_dates:
+                skipped += 1
+                continue
+            row = price_row(price_item)
+            if row is None:
+                logger.warning("Invalid CH_TIMESTAMP '%s' for stock_id=%d; skipping row", price_item.get("CH_TIMESTAMP"), stock_id)
+                invalid += 1
+                continue
+            yield row
+
+    merged = copy_stock_prices(conn, stock_id, valid_rows(), prepared=prepared)
+    if invalid:
+        logger.warning("Skipped %d of %d price rows for %s in file=%s as invalid.", invalid, read, symbol, prices_file)
+    logger.info(
+        "Done ingesting price data for %s from file=%s (%d rows read, %d already stored, %d rows inserted or changed).",
+        symbol, prices_file, read, skipped, merged
+    )
+
+
+def ingest_price_files(
+    conn: psycopg2.extensions.connection,
+    jobs: Iterable[Tuple[int, str, str]],
+    skip_ingested_dates: bool = False
+) -> None:
+    """
+    Ingest (stock_id, symbol, prices_file) jobs one after another on conn,
+    with the merge prepared once for all of them.
+    """
+    with prepared_price_merge(conn):
+        for stock_id, symbol, prices_file in jobs:
+            ingest_prices_for_symbol(
+                conn, stock_id, symbol, prices_file, prepared=True, skip_ingested_dates=skip_ingested_dates
+            )
 
 
-def ingest_all_prices(conn: psycopg2.extensions.connection, config: Dict[str, Any]) -> None:
+def ingest_all_prices(
+    conn: psycopg2.extensions.connection,
+    config: Dict[str, Any],
+    pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None,
+    skip_ingested_dates: bool = False
+) -> None:
     """
     For every symbol in the DB, attempt to load that symbol's prices JSON file
     using the path template in config["output_paths"]["stock_prices"] and upsert them.
+
+    With a pool, the files are split across up to PRICE_INGEST_WORKERS threads,
+    each borrowing its own connection; otherwise they are ingested on conn.
+    skip_ingested_dates is passed on to ingest_prices_for_symbol.
     """
     base_dir = os.path.abspath(os.path.dirname(__file__))  # Get the directory of the script
     prices_template = os.path.join(base_dir, "..", config["output_paths"]["stock_prices"])
@@ -306,47 +640,106 @@ def ingest_all_prices(conn: psycopg2.extensions.connection, config: Dict[str, An
         cur.execute("SELECT id, symbol FROM stocks")
         rows = cur.fetchall()
 
+    # List the prices directory once instead of stat-ing every symbol's file
+    prices_dir = os.path.dirname(prices_template).lower()
+    try:
+        with os.scandir(prices_dir) as entries:
+            available = {entry.name for entry in entries}
+    except FileNotFoundError:
+        logger.warning("Prices directory not found at %s", prices_dir)
+        available = set()
+
+    jobs = []
     for stock_id, symbol in rows:
         prices_file = prices_template.format(symbol=symbol.upper()).lower()
-        if not os.path.exists(prices_file):
+        if os.path.basename(prices_file) not in available:
             logger.warning("No price file found for symbol=%s at path=%s", symbol, prices_file)
             continue
+        jobs.append((stock_id, symbol, prices_file))
+
+    workers = min(len(jobs), PRICE_INGEST_WORKERS, (os.cpu_count() or 1) * 2)
+    if pool is None or workers < 2:
+        ingest_price_files(conn, jobs, skip_ingested_dates)
+        return
+
+    def ingest_chunk(chunk: List[Tuple[int, str, str]]) -> None:
+        worker_conn = pool.getconn()
+        try:
+            ingest_price_files(worker_conn, chunk, skip_ingested_dates)
+        finally:
+            pool.putconn(worker_conn, close=bool(worker_conn.closed))
 
-        ingest_prices_for_symbol(conn, stock_id, symbol, prices_file)
+    # One chunk per worker, so each connection prepares the merge only once
+    logger.info("Ingesting %d price files with %d workers", len(jobs), workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(ingest_chunk, [jobs[i::workers] for i in range(workers)]))
 
 ###############################################################################
 # Main Entry Point
 ###############################################################################
 
-def main() -> None:
+def run_ingest(config: Optional[Dict[str, Any]] = None, skip_ingested_dates: bool = False) -> None:
+    """
+    Run the DB ingestion using an already-parsed pipeline config.
+
+    Args:
+        config (Optional[Dict[str, Any]]): The parsed 'config.json'. If None,
+            only the stock list is ingested and price files are skipped.
+        skip_ingested_dates (bool): Only send price rows for days not yet stored
+            (plus the latest stored day) instead of re-merging whole archives.
     """
-    1) Reads db_config to connect to Postgres.
-    2) Ensures 'stocks' and 'stock_prices' tables exist, with unique index for (stock_id, trade_date).
-    3) Upserts data from 'transformed_stock_list.json' into 'stocks' (for priority = 0).
-    4) Optionally loads each symbol's price file from config paths and upserts them into 'stock_prices'.
-     """
     logger.info("Starting DB ingestion process...")
 
     # 1) Load DB config
     db_config_path = os.path.join(CONFIG_DIR, "db_config.json")
     db_config = get_db_config(db_config_path)
 
-    # 2) Connect & ensure tables exist
+    # 2) Connect & ensure tables exist; the one connection is shared by every step,
+    # and price files are loaded in parallel on pooled connections
     conn = get_db_connection(db_config)
-    ensure_tables_exist(conn)
+    pool = None
+    try:
+        ensure_tables_exist(conn)
 
-    # 3) Ingest the transformed stock list
-    transformed_file = os.path.join(DATA_DIR, "indices", "transformed_stock_list.json")
-    ingest_stocks(conn, transformed_file)
+        # 3) Ingest the transformed stock list
+        transformed_file = os.path.join(DATA_DIR, "indices", "transformed_stock_list.json")
+        ingest_stocks(conn, transformed_file)
 
-    # 4) Ingest all prices
+        # 4) Ingest all prices
+        if config is not None:
+            pool = get_db_pool(db_config, maxconn=PRICE_INGEST_WORKERS)
+            ingest_all_prices(conn, config, pool, skip_ingested_dates)
+    finally:
+        if pool is not None:
+            pool.closeall()
+        conn.close()
+
+
+def main() -> None:
+    """
+    1) Reads db_config to connect to Postgres.
+    2) Ensures 'stocks' and 'stock_prices' tables exist, with unique index for (stock_id, trade_date).
+    3) Upserts data from 'transformed_stock_list.json' into 'stocks' (for priority = 0).
+    4) Optionally loads each symbol's price file from config paths and upserts them into 'stock_prices'.
+     """
+    parser = argparse.ArgumentParser(description="Ingest the stock list and price files into Postgres.")
+    parser.add_argument(
+        "--skip-ingested-dates",
+        action="store_true",
+        help="Only send price rows for days not yet stored for each stock (plus the latest "
+             "stored day). Revisions to older stored days are then not written. Default: off."
+    )
+    args = parser.parse_args()
+
+    configure_logging()
+
+    config = None
     config_path = os.path.join(BASE_DIR, "..", "config.json")
     if os.path.exists(config_path):
         with open(config_path, 'r', encoding='utf-8') as f:
             config = json.load(f)
-        ingest_all_prices(conn, config)
 
-    conn.close()
+    run_ingest(config, skip_ingested_dates=args.skip_ingested_dates)
 
 
 if __name__ == "__main__":
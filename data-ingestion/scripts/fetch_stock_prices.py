@@ -1,12 +1,19 @@
 import os
+import re
 import argparse
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import quote
 from logging.handlers import RotatingFileHandler
 
-from utils.api_helpers import load_api_config, fetch_historical_security_archives, save_json_to_file
+from utils.api_helpers import (
+    load_api_config,
+    fetch_historical_security_archives,
+    fetch_many_historical_security_archives,
+    save_json_to_file,
+)
 
 
 def configure_logging(log_file: str = "fetch_historical_prices.log"):
@@ -27,11 +34,60 @@ def configure_logging(log_file: str = "fetch_historical_prices.log"):
     )
 
 
+# Most common format first; parse_any_date tries them in order
+POSSIBLE_DATE_FORMATS = (
+    "%Y-%m-%d",  # 2023-01-01
+    "%Y/%m/%d",  # 2023/01/01
+    "%m/%d/%Y",  # 01/01/2023
+    "%d-%m-%Y",  # 01-01-2023
+    "%d/%m/%Y",  # 01/01/2023
+)
+# One pass classifies the supported shapes: year-first (Y-m-d, Y/m/d) or
+# year-last (m/d/Y, d/m/Y, d-m-Y), with the same separator used twice
+FAST_DATE_RE = re.compile(
+    r"(?P<y1>[0-9]{4})(?P<s1>[-/])(?P<m1>[0-9]{1,2})(?P=s1)(?P<d1>[0-9]{1,2})"
+    r"|(?P<a2>[0-9]{1,2})(?P<s2>[-/])(?P<b2>[0-9]{1,2})(?P=s2)(?P<y2>[0-9]{4})"
+)
+
+
+def _fast_parse_date(date_str: str) -> Optional[str]:
+    """
+    Regex-dispatched fast path for parse_any_date. Returns 'DD-MM-YYYY', or None
+    when the input needs the strptime fallback. Ambiguous year-last input is
+    resolved in the same order as POSSIBLE_DATE_FORMATS (MM/DD/YYYY before DD/MM/YYYY).
+    """
+    match = FAST_DATE_RE.fullmatch(date_str)
+    if match is None:
+        return None
+
+    if match.group("y1"):
+        candidates = ((int(match.group("y1")), int(match.group("m1")), int(match.group("d1"))),)
+    else:
+        year, a, b = int(match.group("y2")), int(match.group("a2")), int(match.group("b2"))
+        if match.group("s2") == "/":
+            candidates = ((year, a, b), (year, b, a))
+        else:
+            candidates = ((year, b, a),)
+
+    for year, month, day in candidates:
+        try:
+            datetime(year, month, day)
+        except ValueError:
+            continue
+        return "%02d-%02d-%04d" % (day, month, year)
+    return None
+
+
+@lru_cache(maxsize=1024)
 def parse_any_date(date_str: str) -> str:
     """
     Attempt to parse a date string from multiple potential formats
     and return it in 'DD-MM-YYYY' format.
 
+    Input in any of the supported shapes is classified by a single regex and
+    validated with integer arithmetic; strptime is only tried when that misses.
+    Results are cached.
+
     Args:
         date_str: Date string in any supported format 
                   (e.g., 'YYYY-MM-DD', 'DD-MM-YYYY', 'MM/DD/YYYY', etc.).
@@ -42,30 +98,33 @@ def parse_any_date(date_str: str) -> str:
     Raises:
         ValueError: If the date string does not match any known formats.
     """
-    possible_formats = [
-        "%Y-%m-%d",  # 2023-01-01
-        "%Y/%m/%d",  # 2023/01/01
-        "%m/%d/%Y",  # 01/01/2023
-        "%d-%m-%Y",  # 01-01-2023
-        "%d/%m/%Y",  # 01/01/2023
-    ]
-
-    for fmt in possible_formats:
+    parsed = _fast_parse_date(date_str)
+    if parsed is not None:
+        return parsed
+
+    for fmt in POSSIBLE_DATE_FORMATS:
         try:
             dt = datetime.strptime(date_str, fmt)
             return dt.strftime("%d-%m-%Y")
         except ValueError:
             pass
 
-    raise ValueError(f"Unrecognized date format for '{date_str}'. Supported formats include: {possible_formats}")
+    raise ValueError(f"Unrecognized date format for '{date_str}'. Supported formats include: {list(POSSIBLE_DATE_FORMATS)}")
 
 
 def main():
     configure_logging()
     logger = logging.getLogger(__name__)
 
-    parser = argparse.ArgumentParser(description="Fetch historical stock prices for a specific symbol.")
-    parser.add_argument('--symbol', required=True, help="Stock symbol to fetch data for.")
+    parser = argparse.ArgumentParser(description="Fetch historical stock prices for one or more symbols.")
+    parser.add_argument(
+        '--symbol', required=True, nargs='+',
+        help="Stock symbol(s) to fetch data for; several symbols are fetched concurrently."
+    )
+    parser.add_argument(
+        '--workers', type=int, default=4,
+        help="Maximum number of concurrent requests when fetching several symbols (default: 4)."
+    )
     parser.add_argument('--from_date', help="Start date in any common format (defaults to 1 year ago if omitted).")
     parser.add_argument('--to_date', help="End date in any common format (defaults to today if omitted).")
     parser.add_argument(
@@ -75,7 +134,7 @@ def main():
     )
     args = parser.parse_args()
 
-    logger.info("Starting historical prices fetch for symbol: %s", args.symbol)
+    logger.info("Starting historical prices fetch for symbol(s): %s", ", ".join(args.symbol))
 
     # Dynamically resolve config path
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -105,24 +164,36 @@ def main():
         logger.error("Date parsing error: %s", e)
         return
 
-    logger.info("Fetching data from %s to %s for symbol: %s", from_date, to_date, args.symbol)
+    logger.info("Fetching data from %s to %s for symbol(s): %s", from_date, to_date, ", ".join(args.symbol))
 
-    # Encode the symbol to handle special characters
-    encoded_symbol = quote(args.symbol)
+    # Encode the symbols to handle special characters
+    encoded_symbols = {quote(symbol): symbol for symbol in args.symbol}
 
     try:
         # Fetch historical stock prices
-        data = fetch_historical_security_archives(api_config, encoded_symbol, from_date, to_date)
-
-        if data:
-            output_path = args.output.format(symbol=args.symbol.upper())
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)  # Ensure directory exists
-            save_json_to_file(data, output_path)
-            logger.info("Historical prices saved to %s", output_path)
+        if len(encoded_symbols) == 1:
+            encoded_symbol = next(iter(encoded_symbols))
+            results = {encoded_symbol: fetch_historical_security_archives(api_config, encoded_symbol, from_date, to_date)}
         else:
-            logger.warning("No data fetched for symbol: %s", args.symbol)
-    except Exception as e:
-        logger.exception("An error occurred while fetching historical prices for symbol: %s", args.symbol)
+            results = fetch_many_historical_security_archives(
+                api_config, list(encoded_symbols), from_date, to_date, max_workers=args.workers
+            )
+    except Exception:
+        logger.exception("An error occurred while fetching historical prices for symbol(s): %s", ", ".join(args.symbol))
+        return
+
+    for encoded_symbol, data in results.items():
+        symbol = encoded_symbols[encoded_symbol]
+        try:
+            if data:
+                output_path = args.output.format(symbol=symbol.upper())
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)  # Ensure directory exists
+                save_json_to_file(data, output_path)
+                logger.info("Historical prices saved to %s", output_path)
+            else:
+                logger.warning("No data fetched for symbol: %s", symbol)
+        except Exception:
+            logger.exception("An error occurred while saving historical prices for symbol: %s", symbol)
 
 
 if __name__ == '__main__':
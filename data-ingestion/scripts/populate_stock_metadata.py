@@ -25,12 +25,24 @@ Usage Example:
 """
 
 import os
+import re
 import json
+import mmap
 import argparse
 import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
-from logging.handlers import RotatingFileHandler
+from functools import lru_cache, partial
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 
 # --------------------------------------------------------------------------------
 # Logging Configuration
@@ -51,6 +63,24 @@ logger = logging.getLogger(__name__)
 # --------------------------------------------------------------------------------
 DATE_FMT = "%Y-%m-%d"
 DEFAULT_EARLIEST_DATE = "2015-01-01"
+DEFAULT_EARLIEST_DT = datetime.strptime(DEFAULT_EARLIEST_DATE, DATE_FMT)
+# A CH_TIMESTAMP key with its 'YYYY-MM-DD' value, matched on the raw file bytes
+CH_TIMESTAMP_RE = re.compile(rb'"CH_TIMESTAMP"\s*:\s*"(\d{4}-\d{2}-\d{2})"')
+# The exact key/value prefixes our price files are written with, for --trust-format:
+# indented (main.py's merged files) and compact (save_json_to_file)
+CH_TIMESTAMP_NEEDLES = (b'"CH_TIMESTAMP": "', b'"CH_TIMESTAMP":"')
+# Worker processes for scanning; ProcessPoolExecutor rejects more than 61 on Windows
+SCAN_PROCESS_WORKERS = min(os.cpu_count() or 1, 61)
+
+
+@lru_cache(maxsize=8192)
+def parse_date(date_str: str) -> datetime:
+    """
+    Parse a 'YYYY-MM-DD' string into a datetime.
+    Results are cached since the same trading days recur across every price file.
+    Raises ValueError / TypeError like datetime.strptime.
+    """
+    return datetime.strptime(date_str, DATE_FMT)
 
 # --------------------------------------------------------------------------------
 # JSON Utilities
@@ -61,26 +91,45 @@ def load_json_file(file_path: str) -> Any:
     Load and return JSON data from the specified file.
     If the file doesn't exist, return None.
     """
-    if not os.path.exists(file_path):
+    try:
+        with open(file_path, 'rb') as f:
+            logger.info("Loading JSON from %s", file_path)
+            if orjson is not None:
+                return orjson.loads(f.read())
+            return json.load(f)
+    except FileNotFoundError:
         logger.warning("File not found: %s", file_path)
         return None
-    logger.info("Loading JSON from %s", file_path)
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
 
 
 def save_json_file(data: Any, file_path: str) -> None:
     """
     Write the provided data to the specified JSON file.
     Ensures the directory path exists.
+
+    With orjson, a list is written one entry per line so only a single
+    entry is ever serialized in memory at a time.
     """
     directory = os.path.dirname(file_path)
     if directory:  # Only create directories if a directory path is specified
         os.makedirs(directory, exist_ok=True)
     
     logger.info("Saving JSON to %s", file_path)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4)
+    if orjson is None:
+        # json.dump already encodes incrementally into the file
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4)
+        return
+
+    with open(file_path, 'wb') as f:
+        if not isinstance(data, list):
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            return
+        f.write(b"[")
+        for i, entry in enumerate(data):
+            f.write(b"\n  " if i == 0 else b",\n  ")
+            f.write(orjson.dumps(entry))
+        f.write(b"\n]\n" if data else b"]\n")
 
 
 # --------------------------------------------------------------------------------
@@ -92,58 +141,50 @@ def update_or_create_symbol_entry(
     listing_date_str: str,
     earliest_stock_date: str,
     latest_stock_date: str,
-    metadata: List[Dict[str, Any]]
+    metadata: Dict[str, Dict[str, Any]]
 ) -> None:
     """
     Updates or creates an entry for a stock symbol in the metadata.
 
     This function ensures the symbol's metadata includes accurate 
     listing date, start date, and end date. If no stock data is available, 
-    'end_date' remains unset to allow future data fetching.
+    'end_date' remains unset to allow future data fetching; an existing
+    'end_date' is kept rather than cleared.
 
     Args:
         symbol (str): The stock symbol.
         listing_date_str (str): The listing date of the stock in 'YYYY-MM-DD' format.
         earliest_stock_date (str): The earliest date from the fetched stock data.
         latest_stock_date (str): The latest date from the fetched stock data.
-        metadata (List[Dict[str, Any]]): The metadata list to update or append entries.
+        metadata (Dict[str, Dict[str, Any]]): Metadata entries keyed by symbol.
 
     Returns:
-        None: Modifies the 'metadata' list in place.
+        None: Modifies the 'metadata' dict in place.
 
     Raises:
         None: Logs warnings for invalid dates but does not raise exceptions.
     """
-    logger.info("Updating/Creating metadata entry for symbol: %s", symbol)
-
-    # Helper to find an existing metadata entry
-    def find_symbol_in_metadata(symbol: str, entries: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        for entry in entries:
-            if entry.get("symbol") == symbol:
-                return entry
-        return None
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Updating/Creating metadata entry for symbol: %s", symbol)
 
-    existing_entry = find_symbol_in_metadata(symbol, metadata)
+    existing_entry = metadata.get(symbol)
 
     try:
-        listing_date_dt = datetime.strptime(listing_date_str, DATE_FMT)
+        listing_date_dt = parse_date(listing_date_str)
     except (ValueError, TypeError):
-        listing_date_dt = datetime.strptime(DEFAULT_EARLIEST_DATE, DATE_FMT)
+        listing_date_dt = DEFAULT_EARLIEST_DT
         logger.warning("Invalid listing date for %s. Defaulting to %s.", symbol, DEFAULT_EARLIEST_DATE)
 
-    earliest_listed_dt = max(
-        listing_date_dt, 
-        datetime.strptime(DEFAULT_EARLIEST_DATE, DATE_FMT)
-    )
+    earliest_listed_dt = max(listing_date_dt, DEFAULT_EARLIEST_DT)
 
     try:
-        earliest_dt = datetime.strptime(earliest_stock_date, DATE_FMT) if earliest_stock_date else None
+        earliest_dt = parse_date(earliest_stock_date) if earliest_stock_date else None
     except ValueError:
         logger.warning("Invalid earliest stock date for %s. Ignoring.", symbol)
         earliest_dt = None
 
     try:
-        latest_dt = datetime.strptime(latest_stock_date, DATE_FMT) if latest_stock_date else None
+        latest_dt = parse_date(latest_stock_date) if latest_stock_date else None
     except ValueError:
         logger.warning("Invalid latest stock date for %s. Ignoring.", symbol)
         latest_dt = None
@@ -168,22 +209,75 @@ def update_or_create_symbol_entry(
     final_end_date = end_date_dt.strftime(DATE_FMT) if end_date_dt else ""
 
     if not existing_entry:
-        metadata.append({
+        metadata[symbol] = {
             "symbol": symbol,
             "listing_date": final_listing_date,
             "start_date": final_start_date,
             "end_date": final_end_date
-        })
+        }
         logger.info("Created new metadata entry for %s.", symbol)
     else:
         existing_entry["listing_date"] = final_listing_date
         existing_entry["start_date"] = final_start_date
-        existing_entry["end_date"] = final_end_date
+        if final_end_date:
+            existing_entry["end_date"] = final_end_date
+        elif existing_entry.get("end_date"):
+            logger.warning("No price dates found for %s; keeping end_date %s.", symbol, existing_entry["end_date"])
+        else:
+            existing_entry["end_date"] = ""
         logger.info("Updated metadata entry for %s.", symbol)
 
 
 
-def extract_symbol_dates_from_prices(prices_path: str) -> Tuple[str, str]:
+def _min_max_timestamps(buf) -> Tuple[str, str]:
+    """
+    Single pass of CH_TIMESTAMP_RE over a raw price file (bytes or mmap), keeping
+    the running min/max as bytes. 'YYYY-MM-DD' values sort like the dates they
+    represent, so no row is decoded and nothing is parsed; only the two results
+    are turned into str. Returns ("", "") if no timestamps are found.
+    """
+    earliest = latest = None
+    for match in CH_TIMESTAMP_RE.finditer(buf):
+        d = match.group(1)
+        if earliest is None or d < earliest:
+            earliest = d
+        if latest is None or d > latest:
+            latest = d
+    if earliest is None:
+        return "", ""
+    return earliest.decode("ascii"), latest.decode("ascii")
+
+
+def _min_max_timestamps_trusted(buf) -> Tuple[str, str]:
+    """
+    Fast path of _min_max_timestamps for files known to be written as
+    '"CH_TIMESTAMP": "YYYY-MM-DD"' or '"CH_TIMESTAMP":"YYYY-MM-DD"': a plain
+    substring search for the key and a fixed 10-byte slice for the value, with no
+    regex and no validation. A file in neither layout goes through the regex.
+    """
+    find = buf.find
+    for needle in CH_TIMESTAMP_NEEDLES:
+        pos = find(needle)
+        if pos != -1:
+            break
+    else:
+        return _min_max_timestamps(buf)
+    needle_len = len(needle)
+    earliest = latest = None
+    while pos != -1:
+        start = pos + needle_len
+        d = buf[start:start + 10]
+        if earliest is None or d < earliest:
+            earliest = d
+        if latest is None or d > latest:
+            latest = d
+        pos = find(needle, start + 10)
+    if earliest is None:
+        return "", ""
+    return earliest.decode("ascii"), latest.decode("ascii")
+
+
+def extract_symbol_dates_from_prices(prices_path: str, trust_format: bool = False) -> Tuple[str, str]:
     """
     Given a path to a JSON file containing stock prices data (assumed to be a list of objects),
     find the min and max date in 'YYYY-MM-DD' format from the "CH_TIMESTAMP" field.
@@ -199,43 +293,265 @@ def extract_symbol_dates_from_prices(prices_path: str) -> Tuple[str, str]:
         ...
     ]
 
+    The file is memory-mapped and scanned for the CH_TIMESTAMP values directly
+    rather than decoded as JSON. With trust_format, values are sliced out after
+    the exact '"CH_TIMESTAMP": "' (or compact '"CH_TIMESTAMP":"') prefix without
+    being validated.
+
     Return:
         Tuple[str, str]: (earliest_date_str, latest_date_str)
         or ("", "") if no data or file not found or invalid format.
     """
-    logger.debug("Extracting min/max date from prices at: %s", prices_path)
-    data = load_json_file(prices_path)
-    if not data or not isinstance(data, list):
-        logger.warning("No valid list data found in %s", prices_path)
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Extracting min/max date from prices at: %s", prices_path)
+    min_max = _min_max_timestamps_trusted if trust_format else _min_max_timestamps
+    try:
+        with open(prices_path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file, which cannot be mapped
+                earliest, latest = "", ""
+            else:
+                with mm:
+                    earliest, latest = min_max(mm)
+    except FileNotFoundError:
+        logger.info("Prices file not found at %s. Using defaults.", prices_path)
         return "", ""
 
-    date_strings = []
-    for item in data:
-        date_val = item.get("CH_TIMESTAMP")
-        if date_val:
-            date_strings.append(date_val)
-
-    if not date_strings:
-        logger.warning("No 'CH_TIMESTAMP' fields found in %s", prices_path)
+    if not earliest:
+        logger.warning("No valid 'CH_TIMESTAMP' fields found in %s", prices_path)
         return "", ""
 
-    valid_dates = []
-    for d in date_strings:
-        try:
-            valid_dates.append(datetime.strptime(d, DATE_FMT))
-        except ValueError:
-            logger.debug("Skipping invalid CH_TIMESTAMP '%s' in %s", d, prices_path)
+    if debug:
+        logger.debug("Earliest: %s, Latest: %s in %s", earliest, latest, prices_path)
+    return earliest, latest
 
-    if not valid_dates:
-        logger.warning("No valid dates after parsing in %s", prices_path)
-        return "", ""
 
-    earliest = min(valid_dates).strftime(DATE_FMT)
-    latest = max(valid_dates).strftime(DATE_FMT)
-    logger.debug("Earliest: %s, Latest: %s in %s", earliest, latest, prices_path)
+
+def extract_symbol_dates_from_prices_bytes(
+    buf: bytes,
+    source: str = "<bytes>",
+    trust_format: bool = False
+) -> Tuple[str, str]:
+    """
+    Same as extract_symbol_dates_from_prices, for a price file that has already
+    been read into memory. 'source' is only used for log messages.
+    """
+    min_max = _min_max_timestamps_trusted if trust_format else _min_max_timestamps
+    earliest, latest = min_max(buf)
+    if not earliest:
+        logger.warning("No valid 'CH_TIMESTAMP' fields found in %s", source)
     return earliest, latest
 
 
+def read_prices_bytes(prices_path: str) -> Optional[bytes]:
+    """Read a whole prices file in one call, or return None if it doesn't exist."""
+    try:
+        with open(prices_path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=8)
+def _template_parts(prices_template: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a prices path template around its single '{symbol}' placeholder.
+
+    Returns:
+        Optional[Tuple[str, str]]: The lower-cased (prefix, suffix), or None if the
+        template is not a plain single-placeholder template.
+    """
+    parts = prices_template.split("{symbol}")
+    if len(parts) != 2 or any("{" in part or "}" in part for part in parts):
+        return None
+    return parts[0].lower(), parts[1].lower()
+
+
+def prices_path_for(symbol: str, prices_template: str) -> str:
+    """Build the (lower-cased) prices file path for a symbol from the config template."""
+    parts = _template_parts(prices_template)
+    if parts is None:
+        return prices_template.format(symbol=symbol.upper()).lower()
+    # upper() then lower() only differs from lower() for non-ASCII symbols (e.g. "ß")
+    lowered = symbol.lower() if symbol.isascii() else symbol.upper().lower()
+    return parts[0] + lowered + parts[1]
+
+
+def scan_symbol(
+    entry: Tuple[str, str],
+    prices_template: str,
+    trust_format: bool = False
+) -> Tuple[str, str, str, str]:
+    """
+    Resolve the prices file for one index entry and extract its date range.
+
+    Kept free of shared state so it can run in a worker process.
+
+    Args:
+        entry (Tuple[str, str]): (symbol, listing_date) of an eligible index entry,
+            with "" for a missing listing date.
+        prices_template (str): Path template for price files, e.g.
+            "data/stock_prices/{symbol}_historical_prices.json".
+        trust_format (bool): Skip validating CH_TIMESTAMP values (see --trust-format).
+
+    Returns:
+        Tuple[str, str, str, str]: (symbol, listing_date, earliest_stock_date, latest_stock_date),
+        with "" for any value that is unavailable.
+    """
+    symbol, listing_date = entry
+
+    # If listingDate is missing, we'll default to "2015-01-01" in update_or_create_symbol_entry
+    symbol_prices_path = prices_path_for(symbol, prices_template)
+    earliest_stock_date, latest_stock_date = extract_symbol_dates_from_prices(symbol_prices_path, trust_format)
+
+    return symbol, listing_date, earliest_stock_date, latest_stock_date
+
+
+def scan_symbol_buffered(
+    entry: Tuple[str, str],
+    prices_template: str,
+    trust_format: bool = False
+) -> Tuple[str, str, str, str]:
+    """
+    Variant of scan_symbol for the 'threads' I/O backend: the prices file is read
+    in a single call and its dates are extracted from the in-memory buffer, so
+    many reads can be in flight at once on a thread pool.
+    """
+    symbol, listing_date = entry
+
+    symbol_prices_path = prices_path_for(symbol, prices_template)
+    buf = read_prices_bytes(symbol_prices_path)
+    if buf is None:
+        logger.info("Prices file not found for %s at %s. Using defaults.", symbol, symbol_prices_path)
+        earliest_stock_date, latest_stock_date = "", ""
+    else:
+        earliest_stock_date, latest_stock_date = extract_symbol_dates_from_prices_bytes(
+            buf, symbol_prices_path, trust_format
+        )
+
+    return symbol, listing_date, earliest_stock_date, latest_stock_date
+
+
+def scan_prices_buffer(
+    entry: Tuple[str, str],
+    buf: bytes,
+    source: str,
+    trust_format: bool = False
+) -> Tuple[str, str, str, str]:
+    """
+    Extract the date range from a prices file that was already read by the
+    'pipeline' I/O backend. Runs in a worker process.
+    """
+    symbol, listing_date = entry
+    earliest_stock_date, latest_stock_date = extract_symbol_dates_from_prices_bytes(buf, source, trust_format)
+    return symbol, listing_date, earliest_stock_date, latest_stock_date
+
+
+def scan_pipelined(
+    eligible: List[Tuple[str, str]],
+    prices_template: str,
+    trust_format: bool = False
+) -> List[Tuple[str, str, str, str]]:
+    """
+    'pipeline' I/O backend: price files are read on a thread pool and each buffer
+    is handed to a process pool for scanning as soon as its read finishes, so
+    disk reads and scanning overlap. At most 2 * SCAN_PROCESS_WORKERS files are
+    read or waiting to be scanned at a time, so memory stays bounded when reads
+    outpace the scans.
+
+    Args:
+        eligible (List[Tuple[str, str]]): (symbol, listing_date) entries to scan.
+        prices_template (str): Path template for price files.
+        trust_format (bool): Skip validating CH_TIMESTAMP values (see --trust-format).
+
+    Returns:
+        List[Tuple[str, str, str, str]]: One scan_symbol-style result per entry,
+        in the same order as 'eligible'.
+    """
+    scan_futures: List[Optional[Future]] = [None] * len(eligible)
+    # Taken before a file is read, given back once its scan has finished
+    in_flight = threading.BoundedSemaphore(2 * SCAN_PROCESS_WORKERS)
+
+    def finish(i: int, result: Any = None, error: Optional[BaseException] = None) -> None:
+        # Settle entry i without a scan, freeing its in-flight slot
+        scan_futures[i] = done = Future()
+        if error is not None:
+            done.set_exception(error)
+        else:
+            done.set_result(result)
+        in_flight.release()
+
+    with scan_process_pool() as decode_pool:
+
+        def submit_scan(i: int, entry: Tuple[str, str], path: str, read_future: Future) -> None:
+            # Runs on the read thread once the file has been read
+            try:
+                buf = read_future.result()
+            except Exception as e:
+                finish(i, error=e)
+                return
+            if buf is None:
+                logger.info("Prices file not found for %s at %s. Using defaults.", entry[0], path)
+                finish(i, result=(entry[0], entry[1], "", ""))
+                return
+            try:
+                scan_future = decode_pool.submit(scan_prices_buffer, entry, buf, path, trust_format)
+            except Exception as e:  # e.g. BrokenProcessPool
+                finish(i, error=e)
+                return
+            scan_futures[i] = scan_future
+            scan_future.add_done_callback(lambda _: in_flight.release())
+
+        with ThreadPoolExecutor(max_workers=32) as read_pool:
+            for i, entry in enumerate(eligible):
+                in_flight.acquire()
+                path = prices_path_for(entry[0], prices_template)
+                read_future = read_pool.submit(read_prices_bytes, path)
+                read_future.add_done_callback(partial(submit_scan, i, entry, path))
+        # Leaving the read pool waits for every read and its callback
+
+        positions = {future: i for i, future in enumerate(scan_futures)}
+        results: List[Optional[Tuple[str, str, str, str]]] = [None] * len(eligible)
+        for future in as_completed(positions):
+            results[positions[future]] = future.result()
+
+    return results
+
+
+def _init_scan_worker(log_queue: "multiprocessing.Queue") -> None:
+    """
+    Process pool initializer: send the worker's log records to the parent through
+    log_queue. The log file handler it inherited (or re-created on import) is
+    closed, since a RotatingFileHandler is not safe to share between processes.
+    """
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+    root_logger.addHandler(QueueHandler(log_queue))
+
+
+@contextmanager
+def scan_process_pool() -> Iterator[ProcessPoolExecutor]:
+    """
+    A process pool of SCAN_PROCESS_WORKERS workers whose log records are written
+    by this process: a QueueListener hands them to the root logger's handlers.
+    """
+    log_queue = multiprocessing.Queue(-1)
+    listener = QueueListener(log_queue, *logging.getLogger().handlers, respect_handler_level=True)
+    listener.start()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=SCAN_PROCESS_WORKERS,
+            initializer=_init_scan_worker,
+            initargs=(log_queue,)
+        ) as executor:
+            yield executor
+    finally:
+        listener.stop()
+
 
 # --------------------------------------------------------------------------------
 # Main Logic
@@ -255,6 +571,20 @@ def main():
         default="symbol_metadata.json",
         help="Path to the symbol_metadata.json file to create/update. Default: 'symbol_metadata.json'."
     )
+    parser.add_argument(
+        "--io-backend",
+        choices=["process", "threads", "pipeline"],
+        default="process",
+        help="How price files are scanned: 'process' opens and parses each file in a worker process, "
+             "'threads' reads whole files concurrently on a thread pool, 'pipeline' reads on a thread "
+             "pool and scans the buffers in worker processes. Default: 'process'."
+    )
+    parser.add_argument(
+        "--trust-format",
+        action="store_true",
+        help="Assume every price file stores CH_TIMESTAMP exactly as '\"CH_TIMESTAMP\": \"YYYY-MM-DD\"' "
+             "(or compact, without the space) and skip validating the values."
+    )
     args = parser.parse_args()
 
     # 1) Load config.json to find paths
@@ -284,43 +614,66 @@ def main():
         logger.warning("Metadata file %s not a list or doesn't exist. Initializing as empty list.", metadata_file)
         existing_metadata = []
 
+    # Work on a dict keyed by symbol (insertion-ordered, so the file order is
+    # kept) and only turn it back into a list when saving. Entries that can't be
+    # keyed (no symbol, or a symbol seen before) are kept as they are, after the
+    # keyed ones, so nothing in the file is lost
+    metadata: Dict[str, Dict[str, Any]] = {}
+    unkeyed_metadata: List[Any] = []
+    for entry in existing_metadata:
+        symbol = entry.get("symbol") if isinstance(entry, dict) else None
+        if not symbol:
+            logger.warning("Metadata entry without a symbol in %s; keeping it unchanged: %s", metadata_file, entry)
+            unkeyed_metadata.append(entry)
+        elif symbol in metadata:
+            logger.warning("Duplicate metadata entry for %s in %s; only the first is updated", symbol, metadata_file)
+            unkeyed_metadata.append(entry)
+        else:
+            metadata[symbol] = entry
+
     # 4) For each symbol in the index, ensure:
     #    - priority == 0
     #    - listing_date from item["meta_listingDate"]
     #    Then read stock_prices to find min/max date, update metadata.
     logger.info("Processing index data to build/update metadata entries...")
-    for item in index_data.get("data", []):
-        # Skip if priority != 0
-        if item.get("priority") != 0:
-            logger.debug("Skipping symbol due to priority != 0: %s", item.get("symbol"))
-            continue
-
-        symbol = item.get("symbol")
-        if not symbol:
-            logger.debug("Skipping index entry with no symbol: %s", item)
-            continue
-
-        # listing_date is now directly under meta_listingDate
-        listing_date = item.get("meta_listingDate")  # e.g. "YYYY-MM-DD"
+    index_entries = index_data.get("data", [])
+    # listing_date is directly under meta_listingDate ("YYYY-MM-DD"); a missing one
+    # is passed as "" and defaults to "2015-01-01" in update_or_create_symbol_entry
+    eligible = [
+        (item["symbol"], item.get("meta_listingDate") or "")
+        for item in index_entries
+        if item.get("priority") == 0 and item.get("symbol")
+    ]
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Skipping %d index entries with priority != 0 or no symbol",
+            len(index_entries) - len(eligible)
+        )
 
-        # If listingDate is missing, we'll default to "2015-01-01" in update_or_create_symbol_entry
-        symbol_prices_path = prices_template.format(symbol=symbol.upper()).lower()
-        if os.path.exists(symbol_prices_path):
-            earliest_stock_date, latest_stock_date = extract_symbol_dates_from_prices(symbol_prices_path)
-        else:
-            logger.info("Prices file not found for %s at %s. Using defaults.", symbol, symbol_prices_path)
-            earliest_stock_date, latest_stock_date = "", ""
+    # Scanning price files is independent per symbol, so fan it out to a pool;
+    # the metadata update itself stays serial in this process.
+    if args.io_backend == "threads":
+        scan = partial(scan_symbol_buffered, prices_template=prices_template, trust_format=args.trust_format)
+        with ThreadPoolExecutor() as executor:
+            results = list(executor.map(scan, eligible))
+    elif args.io_backend == "pipeline":
+        results = scan_pipelined(eligible, prices_template, args.trust_format)
+    else:
+        scan = partial(scan_symbol, prices_template=prices_template, trust_format=args.trust_format)
+        with scan_process_pool() as executor:
+            results = list(executor.map(scan, eligible, chunksize=32))
 
+    for symbol, listing_date, earliest_stock_date, latest_stock_date in results:
         update_or_create_symbol_entry(
             symbol=symbol,
-            listing_date_str=listing_date if listing_date else "",
+            listing_date_str=listing_date,
             earliest_stock_date=earliest_stock_date,
             latest_stock_date=latest_stock_date,
-            metadata=existing_metadata
+            metadata=metadata
         )
 
     # 5) Save the updated metadata
-    save_json_file(existing_metadata, metadata_file)
+    save_json_file(list(metadata.values()) + unkeyed_metadata, metadata_file)
     logger.info("Metadata successfully updated in %s", metadata_file)
 
 
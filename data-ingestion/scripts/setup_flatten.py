@@ -0,0 +1,14 @@
+"""
+Build the optional Cython flattener used by transform_stock_list.py.
+
+Usage Example:
+    python setup_flatten.py build_ext --inplace
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="smarket-flatten",
+    ext_modules=cythonize("_flatten.pyx", language_level=3),
+)
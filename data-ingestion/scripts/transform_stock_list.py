@@ -4,6 +4,25 @@ import argparse
 import logging
 from logging.handlers import RotatingFileHandler
 import shutil
+import multiprocessing
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to loading the whole file
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only needed for --format parquet
+    pa = None
 
 # --------------------------------------------------------------------------------
 # Logging Configuration
@@ -19,6 +38,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# --------------------------------------------------------------------------------
+# Constants
+# --------------------------------------------------------------------------------
+META_PREFIX = "meta_"
+# Inputs at least this large are flattened and serialized on a process pool
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+PARALLEL_CHUNKSIZE = 256
+# Give up on generated flatteners after this many schema changes
+MAX_RESPECIALIZATIONS = 8
+
 # --------------------------------------------------------------------------------
 # Utility Functions
 # --------------------------------------------------------------------------------
@@ -28,15 +57,101 @@ def load_json_file(file_path: str) -> dict:
     if not os.path.exists(file_path):
         logger.error("File not found: %s", file_path)
         return {}
-    with open(file_path, 'r', encoding='utf-8') as f:
+    with open(file_path, 'rb') as f:
         logger.info("Loading JSON from %s", file_path)
+        if orjson is not None:
+            return orjson.loads(f.read())
         return json.load(f)
 
-def save_json_file(data: dict, file_path: str) -> None:
-    """Save JSON data to a file."""
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4)
+def iter_stock_items(file_path: str) -> Iterator[dict]:
+    """
+    Yield the stock records under 'data' in a stock list JSON file.
+    With ijson the file is stream-parsed, so only one record is in memory at a time.
+    """
+    if ijson is None:
+        yield from load_json_file(file_path).get("data", [])
+        return
+    with open(file_path, 'rb') as f:
+        logger.info("Streaming JSON from %s", file_path)
+        # use_float so numbers come back as float rather than Decimal, as with json.load
+        yield from ijson.items(f, "data.item", use_float=True)
+
+def dump_record(record: dict, pretty: bool = False) -> bytes:
+    """Serialize a single record to JSON bytes, compact unless pretty is set."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(record, indent=2).encode('utf-8')
+    return json.dumps(record, separators=(',', ':')).encode('utf-8')
+
+def save_json_stream(encoded_records: Iterable[bytes], file_path: str, pretty: bool = False) -> int:
+    """
+    Write already-serialized records (see dump_record) to a file as {"data": [...]},
+    as they arrive. With pretty, records are separated by newlines.
+    Returns the number of records written.
+    """
+    separator = b",\n" if pretty else b","
+    count = 0
+    with open(file_path, 'wb') as f:
+        f.write(b'{"data": [\n' if pretty else b'{"data":[')
+        for encoded in encoded_records:
+            if count:
+                f.write(separator)
+            f.write(encoded)
+            count += 1
+        f.write(b"\n]}\n" if pretty else b"]}")
     logger.info("Saved JSON to %s", file_path)
+    return count
+
+def save_jsonl_stream(encoded_records: Iterable[bytes], file_path: str) -> int:
+    """
+    Write already-serialized records (see dump_record) to a file as JSON Lines
+    (one JSON object per line), as they arrive. Returns the number of records written.
+    """
+    count = 0
+    with open(file_path, 'wb') as f:
+        for encoded in encoded_records:
+            f.write(encoded)
+            f.write(b"\n")
+            count += 1
+    logger.info("Saved JSON Lines to %s", file_path)
+    return count
+
+def save_parquet(columns: Dict[str, List], file_path: str) -> int:
+    """
+    Write column lists (see flatten_to_columns) to a Parquet file.
+    Returns the number of records written.
+    """
+    arrays = {}
+    for name, values in columns.items():
+        try:
+            arrays[name] = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed-type columns (e.g. '-' placeholders among numbers) are stored as JSON text
+            arrays[name] = pa.array(
+                [None if value is None else dump_record(value).decode('utf-8') for value in values],
+                type=pa.string()
+            )
+    table = pa.table(arrays)
+    pq.write_table(table, file_path)
+    logger.info("Saved Parquet to %s", file_path)
+    return table.num_rows
+
+def backup_file(file_path: str, backup_path: str) -> None:
+    """
+    Keep a backup of file_path at backup_path as a hard link, so no data is
+    copied, falling back to a full copy where links aren't possible (e.g. across
+    devices). This relies on the input being replaced rather than rewritten in
+    place, which save_json_to_file in utils/api_helpers.py does.
+    """
+    try:
+        os.remove(backup_path)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(file_path, backup_path)
+    except OSError:
+        shutil.copy(file_path, backup_path)
 
 def flatten_stock_item(item: dict) -> dict:
     """
@@ -54,26 +169,138 @@ def flatten_stock_item(item: dict) -> dict:
             "meta_someKey": "value"
         }
     """
-    flattened = {}
-    for key, value in item.items():
-        if key == 'meta' and isinstance(value, dict):
-            # Flatten 'meta' dict
-            for mkey, mval in value.items():
-                flattened[f"meta_{mkey}"] = mval
-        else:
-            # Keep top-level keys as is
-            flattened[key] = value
-    return flattened
+    meta = item.get('meta')
+    if type(meta) is not dict:
+        # Nothing to flatten; a non-dict 'meta' is kept as is
+        return dict(item)
+    return {
+        **{key: value for key, value in item.items() if key != 'meta'},
+        **{META_PREFIX + mkey: mval for mkey, mval in meta.items()}
+    }
+
+try:
+    # Compiled version of the above, built with setup_flatten.py
+    from _flatten import flatten_stock_item
+    HAVE_COMPILED_FLATTEN = True
+except ImportError:  # the Cython build is optional; keep the Python version
+    HAVE_COMPILED_FLATTEN = False
+
+def specialize_flattener(sample: dict) -> Callable[[dict], dict]:
+    """
+    Generate a flattener for records shaped exactly like 'sample': a single dict
+    display with one lookup per known key, with no loop over the keys.
 
-def flatten_stock_list(stock_list: dict) -> list:
+    The generated function raises KeyError for a record of any other shape
+    (different keys, or 'meta' present/absent or a dict/not a dict where the
+    sample differs), so the caller can fall back or re-specialize.
     """
-    Flatten each stock record in stock_list['data'] by pulling nested 'meta' fields up.
+    meta = sample.get('meta')
+    top_keys = [key for key in sample if key != 'meta' or type(meta) is not dict]
+    lines = ["def flatten(it):"]
+    if type(meta) is dict:
+        lines += [
+            "    m = it['meta']",
+            f"    if len(it) != {len(sample)} or type(m) is not dict or len(m) != {len(meta)}:",
+            "        raise KeyError('meta')",
+        ]
+        meta_items = [f"{META_PREFIX + mkey!r}: m[{mkey!r}]" for mkey in meta]
+    else:
+        lines += [
+            f"    if len(it) != {len(sample)} or type(it.get('meta')) is dict:",
+            "        raise KeyError('meta')",
+        ]
+        meta_items = []
+    items = [f"{key!r}: it[{key!r}]" for key in top_keys] + meta_items
+    lines.append("    return {" + ", ".join(items) + "}")
+
+    namespace: Dict[str, Callable[[dict], dict]] = {}
+    exec(compile("\n".join(lines), "<flatten>", "exec"), namespace)
+    return namespace["flatten"]
+
+# Flattener generated for the most recent record schema, per process
+_specialized_flatten = None
+_respecializations = 0
+
+def flatten_specialized(item: dict) -> dict:
+    """
+    Same result as flatten_stock_item, through a flattener generated for the
+    current record schema (see specialize_flattener). A record with a new schema
+    re-specializes, until MAX_RESPECIALIZATIONS is reached, after which the
+    generic flatten_stock_item is used.
+    """
+    global _specialized_flatten, _respecializations
+    if _specialized_flatten is not None:
+        try:
+            return _specialized_flatten(item)
+        except KeyError:
+            pass
+    if _respecializations >= MAX_RESPECIALIZATIONS:
+        return flatten_stock_item(item)
+    _respecializations += 1
+    _specialized_flatten = specialize_flattener(item)
+    return _specialized_flatten(item)
+
+# The compiled flattener when it is built, else the schema-specialized one
+flatten_record = flatten_stock_item if HAVE_COMPILED_FLATTEN else flatten_specialized
+
+def flatten_stock_list(items: Iterable[dict]) -> Iterator[dict]:
+    """
+    Lazily flatten each stock record (e.g. from iter_stock_items) by pulling nested 'meta' fields up.
+    """
+    for item in items:
+        yield flatten_record(item)
+
+def flatten_to_columns(items: Iterable[dict]) -> Dict[str, List]:
+    """
+    Flatten stock records straight into one list per column ('symbol', 'priority',
+    'meta_listingDate', ...), without building a flattened dict per record.
+    Records that lack a column get None in it.
+    """
+    columns: Dict[str, List] = {}
+    count = 0
+    for item in items:
+        meta = item.get('meta')
+        flatten_meta = type(meta) is dict
+        for key, value in item.items():
+            if flatten_meta and key == 'meta':
+                continue
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * count
+            column.append(value)
+        if flatten_meta:
+            for mkey, mval in meta.items():
+                key = META_PREFIX + mkey
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = [None] * count
+                if len(column) > count:
+                    # A top-level key of the same name; 'meta' wins, as in flatten_stock_item
+                    column[-1] = mval
+                else:
+                    column.append(mval)
+        count += 1
+        for column in columns.values():
+            if len(column) < count:
+                column.append(None)
+    return columns
+
+def flatten_encoded(item: dict, pretty: bool = False) -> bytes:
+    """Flatten a single stock item and serialize it; the unit of work for the process pool."""
+    return dump_record(flatten_record(item), pretty)
+
+def encode_flattened(items: Iterable[dict], workers: int = 1, pretty: bool = False) -> Iterator[bytes]:
+    """
+    Flatten and serialize stock records, in input order. With more than one worker
+    this is spread over a multiprocessing.Pool, and the workers send back the
+    encoded bytes so nothing is serialized twice.
     """
-    flattened_list = []
-    data = stock_list.get("data", [])
-    for item in data:
-        flattened_list.append(flatten_stock_item(item))
-    return flattened_list
+    if workers <= 1:
+        for flattened in flatten_stock_list(items):
+            yield dump_record(flattened, pretty)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap(partial(flatten_encoded, pretty=pretty), items, chunksize=PARALLEL_CHUNKSIZE)
 
 # --------------------------------------------------------------------------------
 # Main Function
@@ -88,6 +315,19 @@ def main():
         required=True,
         help="Path to the original stock list JSON"
     )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl", "parquet"],
+        default="json",
+        help="Output format: 'json' writes {\"data\": [...]}, 'jsonl' writes one flattened "
+             "record per line to a .jsonl file, 'parquet' writes a columnar .parquet file "
+             "(requires pyarrow). Default: 'json'."
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent each record in 'json' output. By default the output is compact."
+    )
     
     args = parser.parse_args()
 
@@ -96,29 +336,53 @@ def main():
     if not os.path.isfile(input_file):
             logger.error("Provided input path is not a valid file: %s", input_file)
             return
+    if args.format == "parquet" and pa is None:
+        logger.error("--format parquet requires pyarrow, which is not installed")
+        return
     
     input_dir = os.path.dirname(input_file)
     input_basename = os.path.basename(input_file)
+    if args.format != "json":
+        input_basename = f"{os.path.splitext(input_basename)[0]}.{args.format}"
     output_file = os.path.join(input_dir, f"transformed_{input_basename}")
 
-    # 1) Load the original data
-    stock_list = load_json_file(input_file)
-    if not stock_list:
-        logger.error("No valid data found in %s", input_file)
-        return
-
-    # 2) Backup the input file (optional)
+    # 1) Backup the input file (optional)
     backup_path = f"{input_file}.backup"
     if os.path.exists(input_file):
-        shutil.copy(input_file, backup_path)
+        backup_file(input_file, backup_path)
         logger.info("Created backup of the original file at %s", backup_path)
 
-    # 3) Flatten
-    flattened_list = flatten_stock_list(stock_list)
-
-    # 4) Save to a new output file
-    save_json_file({"data": flattened_list}, output_file)
-    logger.info("Flattening complete. Results saved to %s", output_file)
+    # 2) Stream the records through the flattener into the new output file
+    # Only large inputs are worth the cost of starting a process pool
+    workers = 1
+    if args.format != "parquet" and os.path.getsize(input_file) >= PARALLEL_MIN_BYTES:
+        workers = os.cpu_count() or 1
+        logger.info("Flattening with %d worker processes", workers)
+    # Write to a temporary file and swap it in, so readers never see a partial output
+    tmp_output_file = f"{output_file}.tmp"
+    try:
+        if args.format == "parquet":
+            count = save_parquet(flatten_to_columns(iter_stock_items(input_file)), tmp_output_file)
+        else:
+            # JSON Lines needs one record per line, so it is never pretty-printed
+            pretty = args.pretty and args.format == "json"
+            encoded_records = encode_flattened(iter_stock_items(input_file), workers, pretty)
+            if args.format == "jsonl":
+                count = save_jsonl_stream(encoded_records, tmp_output_file)
+            else:
+                count = save_json_stream(encoded_records, tmp_output_file, pretty)
+        if not count:
+            # Keep the previous output rather than replacing it with an empty one
+            if os.path.exists(tmp_output_file):
+                os.remove(tmp_output_file)
+            logger.error("No valid data found in %s", input_file)
+            return
+        os.replace(tmp_output_file, output_file)
+    except BaseException:
+        if os.path.exists(tmp_output_file):
+            os.remove(tmp_output_file)
+        raise
+    logger.info("Flattening complete. %d records saved to %s", count, output_file)
 
 if __name__ == "__main__":
     main()
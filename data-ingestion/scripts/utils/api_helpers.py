@@ -1,20 +1,44 @@
 import os
 import json
+import queue
+import atexit
 import logging
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http.cookiejar import LoadError, MozillaCookieJar
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Any, Union
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Sequence, Tuple, Union
 import requests
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import requests_cache
+except ImportError:  # requests-cache is optional; SMARKET_HTTP_CACHE is ignored without it
+    requests_cache = None
+
+
+# Parent logger for this package; modules log to 'smarket.<module>'
+SMARKET_LOGGER = "smarket"
+
 
 def configure_logging(log_file: str = 'logs/api.log', log_level: int = logging.INFO) -> None:
     """
-    Configure application-wide logging with rotation and console output.
+    Configure the 'smarket' package logger with rotation and console output.
     
     Creates the log directory if it doesn't exist and sets up both file and console handlers.
+    The logger itself only gets a QueueHandler; a QueueListener thread owns the file
+    and console handlers, so bursts of request errors never block callers on log I/O.
+    Safe to call more than once; only the first call adds handlers.
     
     Args:
         log_file: Path to the log file (default: 'logs/api.log')
@@ -23,18 +47,21 @@ def configure_logging(log_file: str = 'logs/api.log', log_level: int = logging.I
     Returns:
         None
     """
+    package_logger = logging.getLogger(SMARKET_LOGGER)
+    
+    # Only configure once, even if called again or the module is reloaded
+    if getattr(configure_logging, '_done', False) or package_logger.handlers:
+        return
+    
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
     
     # Create formatter
     formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
     
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-    
-    # Clear existing handlers to avoid duplicate logging
-    if root_logger.handlers:
-        root_logger.handlers.clear()
+    # Configure the package logger; it doesn't propagate, so the root logger and
+    # its handlers are left to the calling script
+    package_logger.setLevel(log_level)
+    package_logger.propagate = False
     
     # Add rotating file handler
     file_handler = RotatingFileHandler(
@@ -43,28 +70,100 @@ def configure_logging(log_file: str = 'logs/api.log', log_level: int = logging.I
         backupCount=5
     )
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
     
     # Add console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    
+    # Write both from a background thread, stopped (and flushed) at exit
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    package_logger.addHandler(QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+    
+    configure_logging._done = True
 
 
 # Initialize logging
 configure_logging()
-logger = logging.getLogger(__name__)
+logger = logging.getLogger(f"{SMARKET_LOGGER}.api_helpers")
+
+NSE_HOME_URL = "https://www.nseindia.com"
+NSE_QUOTE_URL = "https://www.nseindia.com/get-quotes/equity?symbol={symbol}"
 
+# Keep-alive connections per host that concurrent fetches share; more requests
+# in flight wait for a free connection rather than opening new sockets, which
+# NSE tends to rate-limit or reset
+NSE_MAX_CONNECTIONS = 4
 
-def load_api_config(config_path: str) -> Dict[str, Any]:
+# Updated User-Agent to a more recent browser
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.nseindia.com/get-quotes/equity?symbol=JSWSTEEL",
+    "X-Requested-With": "XMLHttpRequest",
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Site": "same-origin",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+    "Connection": "keep-alive"
+}
+
+
+# Parsed API configs by path, with the (st_mtime_ns, st_size) they were read at
+_CFG_CACHE: Dict[str, Tuple[int, int, Mapping[str, Any]]] = {}
+_CFG_CACHE_LOCK = threading.Lock()
+
+
+# NSE cookies are kept on disk between runs, next to this module so every script
+# shares them whatever its working directory; the warm-up GETs are skipped while
+# the last warm-up is younger than COOKIE_WARMUP_TTL_S
+COOKIE_JAR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".nse_cookies.txt")
+COOKIE_WARMUP_TTL_S = 30 * 60
+
+_COOKIE_JAR = MozillaCookieJar(COOKIE_JAR_PATH)
+try:
+    _COOKIE_JAR.load(ignore_discard=True)
+    # The jar's mtime is the time of the last warm-up (see _save_cookie_jar), so
+    # the age of cookies fetched by a previous run counts too
+    _last_warmup_ts = os.path.getmtime(COOKIE_JAR_PATH)
+except (OSError, LoadError):
+    _last_warmup_ts = 0.0
+
+
+def _save_cookie_jar() -> None:
+    """
+    Persist the NSE cookies for the next run (registered with atexit).
+    
+    The file's mtime is then set to the last warm-up rather than left at the
+    save time, so runs that only reuse the cookies don't keep them "fresh".
+    """
+    try:
+        _COOKIE_JAR.save(ignore_discard=True)
+        os.utime(COOKIE_JAR_PATH, (_last_warmup_ts, _last_warmup_ts))
+    except OSError as e:
+        logger.warning("Could not save NSE cookies to %s: %s", COOKIE_JAR_PATH, str(e))
+
+
+atexit.register(_save_cookie_jar)
+
+
+def load_api_config(config_path: str) -> Mapping[str, Any]:
     """
     Load and validate API configuration from a JSON file.
     
+    The parsed configuration is cached per path and only re-read when the
+    file's modification time or size changes. Since every caller shares the
+    cached object, it is returned as a read-only view.
+    
     Args:
         config_path: Path to the JSON configuration file
     
     Returns:
-        Dict containing the API configuration
+        Read-only mapping containing the API configuration
         
     Raises:
         FileNotFoundError: If the configuration file doesn't exist
@@ -74,8 +173,16 @@ def load_api_config(config_path: str) -> Dict[str, Any]:
     try:
         normalized_path = os.path.normpath(config_path).replace("\\", "/")
         
-        with open(normalized_path, 'r') as file:
-            api_config = json.load(file)
+        st = os.stat(normalized_path)
+        with _CFG_CACHE_LOCK:
+            cached = _CFG_CACHE.get(normalized_path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            logger.debug("Using cached API configuration for %s", normalized_path)
+            return cached[2]
+        
+        with open(normalized_path, 'rb') as file:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            api_config = orjson.loads(file.read()) if orjson is not None else json.load(file)
         
         # Validate essential configuration fields
         required_fields = ['nse_base_url', 'endpoints', 'default_index_name']
@@ -94,6 +201,11 @@ def load_api_config(config_path: str) -> Dict[str, Any]:
         if missing_endpoints:
             raise ValueError(f"Missing required endpoints in configuration: {', '.join(missing_endpoints)}")
         
+        api_config['endpoints'] = MappingProxyType(api_config['endpoints'])
+        api_config = MappingProxyType(api_config)
+        with _CFG_CACHE_LOCK:
+            _CFG_CACHE[normalized_path] = (st.st_mtime_ns, st.st_size, api_config)
+        
         logger.info("Successfully loaded API configuration from %s", normalized_path)
         return api_config
         
@@ -110,41 +222,191 @@ def load_api_config(config_path: str) -> Dict[str, Any]:
 
 def create_session() -> requests.Session:
     """
-    Create and configure a requests session with retry logic.
+    Create and configure a requests session with retry logic and a connection
+    pool of at most NSE_MAX_CONNECTIONS reused connections per host.
+    
+    When the SMARKET_HTTP_CACHE environment variable is "1" and requests-cache is
+    installed, NSE API responses are cached in a local SQLite file ('.http_cache')
+    for 6 hours, so re-runs on the same day don't hit NSE again. The warm-up pages
+    are never cached, so a warm-up always gets fresh cookies from NSE.
     
     Returns:
         A configured requests.Session object with retry capabilities
     """
-    session = requests.Session()
+    if os.environ.get("SMARKET_HTTP_CACHE") == "1" and requests_cache is not None:
+        session = requests_cache.CachedSession(
+            '.http_cache',
+            backend='sqlite',
+            allowable_methods=['GET'],
+            expire_after=requests_cache.DO_NOT_CACHE,
+            urls_expire_after={f"{NSE_HOME_URL}/api/*": timedelta(hours=6)}
+        )
+    else:
+        if os.environ.get("SMARKET_HTTP_CACHE") == "1":
+            logger.warning("SMARKET_HTTP_CACHE is set but requests-cache is not installed; not caching")
+        session = requests.Session()
     
-    # Configure retry strategy
+    # Configure retry strategy; NSE rate-limits and drops connections often enough
+    # that a few quick retries save re-running the whole pipeline
     retry_strategy = Retry(
-        total=3,  # Maximum number of retries
-        backoff_factor=1,  # Time factor between retries (1s, 2s, 4s)
+        total=5,  # Maximum number of retries
+        backoff_factor=0.5,  # Time factor between retries (0.5s, 1s, 2s, 4s, ...)
         status_forcelist=[429, 500, 502, 503, 504],  # Retry on these status codes
-        allowed_methods=["GET"]  # Only retry GET requests
+        allowed_methods=["GET"],  # Only retry GET requests
+        respect_retry_after_header=True  # Wait as long as a 429/503 Retry-After asks
     )
     
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=NSE_MAX_CONNECTIONS,
+        pool_block=True,  # Wait for a pooled connection instead of opening a throwaway one
+        max_retries=retry_strategy
+    )
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     
+    # Share the persistent NSE cookie jar, and send the browser-like headers on every request
+    session.cookies = _COOKIE_JAR
+    session.headers.update(DEFAULT_HEADERS)
+    if requests_cache is not None and isinstance(session, requests_cache.CachedSession):
+        # requests-cache never reads from the cache for a no-cache request
+        session.headers.pop("Cache-Control", None)
+        session.headers.pop("Pragma", None)
+    
     return session
 
 
+@lru_cache(maxsize=4)
+def _session_for(base_url: str) -> requests.Session:
+    """
+    Return the shared session for an API base URL, creating it on first use.
+    
+    Reusing one session keeps connections (and cookies) alive across calls
+    instead of paying a new TCP/TLS handshake for every request.
+    
+    Args:
+        base_url: The base URL of the API
+    
+    Returns:
+        The requests.Session used for all calls to base_url
+    """
+    return create_session()
+
+
+_PACE_LOCK = threading.Lock()
+_next_request_ts = 0.0
+
+
+def _pace(min_interval_s: float) -> None:
+    """
+    Block until at least min_interval_s has passed since the previous paced
+    request (a one-token bucket on the monotonic clock). A no-op for 0.
+    """
+    global _next_request_ts
+    if min_interval_s <= 0:
+        return
+    with _PACE_LOCK:
+        now = time.monotonic()
+        wait = _next_request_ts - now
+        _next_request_ts = max(now, _next_request_ts) + min_interval_s
+    if wait > 0:
+        time.sleep(wait)
+
+
+def _warm_cookies(
+    session: requests.Session,
+    headers: Optional[Dict[str, str]],
+    timeout: int,
+    symbol: str = 'NIFTY',
+    min_interval_s: float = 0.0
+) -> None:
+    """
+    Visit the NSE homepage and a quote page so the shared cookie jar holds NSE's
+    cookies, and record when that happened.
+    
+    Failures are logged and ignored, as the API call might still work.
+    """
+    global _last_warmup_ts
+    try:
+        # First visit homepage
+        logger.debug("Loading cookies from NSE homepage")
+        _pace(min_interval_s)
+        homepage_response = session.get(
+            NSE_HOME_URL, 
+            headers=headers,
+            timeout=timeout
+        )
+        homepage_response.raise_for_status()
+        
+        # Then visit the quotes page for the symbol
+        logger.debug("Loading cookies from stock quote page")
+        _pace(min_interval_s)
+        quotes_response = session.get(
+            NSE_QUOTE_URL.format(symbol=symbol),
+            headers=headers,
+            timeout=timeout
+        )
+        quotes_response.raise_for_status()
+        
+        _last_warmup_ts = time.time()
+        logger.info("Successfully loaded cookies from NSE India")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Session cookies: %s", requests.utils.dict_from_cookiejar(session.cookies))
+    except requests.exceptions.RequestException as e:
+        logger.warning("Failed to load initial cookies: %s", str(e))
+
+
+_WARMUP_LOCK = threading.Lock()
+
+
+def _ensure_warm(
+    session: requests.Session,
+    headers: Optional[Dict[str, str]],
+    timeout: int,
+    symbol: str = 'NIFTY',
+    min_interval_s: float = 0.0,
+    rejected_warmup_ts: Optional[float] = None
+) -> None:
+    """
+    Run the cookie warm-up unless it succeeded less than COOKIE_WARMUP_TTL_S ago.
+    
+    With rejected_warmup_ts (the _last_warmup_ts a rejected request was sent
+    under), the cookies are known to be stale and are refreshed regardless of
+    age, unless another thread has already done so since.
+    
+    The lock makes concurrent callers wait for a single warm-up instead of each
+    running their own.
+    """
+    def is_fresh() -> bool:
+        if rejected_warmup_ts is not None:
+            return _last_warmup_ts > rejected_warmup_ts
+        return time.time() - _last_warmup_ts < COOKIE_WARMUP_TTL_S
+    
+    if is_fresh():
+        return
+    with _WARMUP_LOCK:
+        # Another thread may have warmed up while this one waited
+        if is_fresh():
+            return
+        _warm_cookies(session, headers, timeout, symbol, min_interval_s)
+
+
 def fetch_data_from_api(
     base_url: str, 
     endpoint: str, 
     params: Optional[Dict[str, str]] = None, 
     headers: Optional[Dict[str, str]] = None,
     timeout: int = 30,
-    max_retries: int = 3
+    min_interval_s: float = 0.0
 ) -> Optional[Dict[str, Any]]:
     """
     Fetch data from an API endpoint with robust error handling and retry logic.
     
-    First loads initial cookies from NSE India website before making the actual API request.
-    Implements retries with exponential backoff for transient failures.
+    First loads initial cookies from NSE India website before making the actual API request,
+    unless that was done less than COOKIE_WARMUP_TTL_S ago (cookies persist across runs).
+    If NSE answers 401/403, the cookies are refreshed and the request retried once.
+    Connection errors and 429/5xx responses are retried with exponential backoff
+    by the session's urllib3 Retry strategy (see create_session).
     
     Args:
         base_url: The base URL of the API
@@ -152,110 +414,98 @@ def fetch_data_from_api(
         params: Optional query parameters for the request
         headers: Optional custom headers to include in the request
         timeout: Request timeout in seconds (default: 30)
-        max_retries: Maximum number of manual retries for non-status code failures (default: 3)
+        min_interval_s: Minimum spacing in seconds between requests made by this
+            process, if NSE needs to be paced (default: 0.0, no pacing)
     
     Returns:
         JSON response data as a dictionary, or None if the request failed
     """
     url = f"{base_url.rstrip('/')}/{endpoint.lstrip('/')}"
     
-    # Updated User-Agent to a more recent browser
-    default_headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-        "Accept": "application/json, text/javascript, */*; q=0.01",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Referer": "https://www.nseindia.com/get-quotes/equity?symbol=JSWSTEEL",
-        "X-Requested-With": "XMLHttpRequest",
-        "Sec-Fetch-Dest": "empty",
-        "Sec-Fetch-Mode": "cors",
-        "Sec-Fetch-Site": "same-origin",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
-        "Connection": "keep-alive"
-    }
-
-    # Merge default headers with custom headers, with custom headers taking precedence
-    merged_headers = {**default_headers, **(headers or {})}
-    
-    session = create_session()
-    retry_count = 0
-    
-    while retry_count <= max_retries:
-        try:
-            # Step 1: Load initial cookies from multiple pages
-            try:
-                # First visit homepage
-                logger.info("Loading cookies from NSE homepage")
-                homepage_response = session.get(
-                    "https://www.nseindia.com", 
-                    headers=merged_headers,
-                    timeout=timeout
-                )
-                homepage_response.raise_for_status()
-                
-                # Wait a bit to simulate human behavior
-                time.sleep(3)
-                
-                # Then visit the quotes page for the symbol
-                logger.info("Loading cookies from stock quote page")
-                symbol = params.get('symbol', 'NIFTY') if params else 'NIFTY'
-                quotes_response = session.get(
-                    f"https://www.nseindia.com/get-quotes/equity?symbol={symbol}",
-                    headers=merged_headers,
-                    timeout=timeout
-                )
-                quotes_response.raise_for_status()
-                
-                # Wait again before making the API call
-                time.sleep(2)
-                
-                logger.info("Successfully loaded cookies from NSE India")
-                logger.debug("Session cookies: %s", session.cookies.get_dict())
-            except requests.exceptions.RequestException as e:
-                logger.warning("Failed to load initial cookies: %s", str(e))
-                # Continue anyway as the main request might still work
-            
-            # Step 2: Fetch the API data
-            logger.info("Fetching data from API: %s", url)
+    # The session already sends DEFAULT_HEADERS; custom headers take precedence per request
+    session = _session_for(base_url)
+    
+    # Step 1: Load initial cookies from multiple pages, unless they are still fresh
+    symbol = params.get('symbol', 'NIFTY') if params else 'NIFTY'
+    _ensure_warm(session, headers, timeout, symbol, min_interval_s)
+    
+    # Step 2: Fetch the API data; transient failures have already been retried
+    # by the session's urllib3 Retry strategy
+    try:
+        logger.debug("Fetching data from API: %s", url)
+        warmup_ts = _last_warmup_ts
+        _pace(min_interval_s)
+        response = session.get(
+            url, 
+            params=params, 
+            headers=headers,
+            timeout=timeout
+        )
+        if response.status_code in (401, 403):
+            # The cookies expired before the TTL: refresh them and retry once
+            logger.info("NSE rejected the session cookies (HTTP %d); warming up again", response.status_code)
+            _ensure_warm(session, headers, timeout, symbol, min_interval_s, rejected_warmup_ts=warmup_ts)
+            _pace(min_interval_s)
             response = session.get(
                 url, 
                 params=params, 
-                headers=merged_headers,
+                headers=headers,
                 timeout=timeout
             )
-            response.raise_for_status()
-            
-            # Check if response is valid JSON
-            data = response.json()
-            logger.info("Successfully fetched data from API: %s", url)
-            return data
-            
-        except requests.exceptions.JSONDecodeError as e:
-            logger.error("Invalid JSON in API response: %s. Error: %s", url, str(e))
-            retry_count += 1
-            
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Error fetching data from API: {url}. Error: {str(e)}"
-            
-            # Check if we should retry or give up
-            if retry_count < max_retries:
-                wait_time = 2 ** retry_count  # Exponential backoff: 1s, 2s, 4s, etc.
-                logger.warning(
-                    "%s. Retrying in %s seconds (attempt %s/%s)...", 
-                    error_msg, wait_time, retry_count + 1, max_retries
-                )
-                time.sleep(wait_time)
-                retry_count += 1
-            else:
-                logger.error("%s. Maximum retries reached.", error_msg)
-                return None
+        response.raise_for_status()
+        
+        # Check if response is valid JSON
+        data = response.json()
+        logger.debug("Successfully fetched data from API: %s", url)
+        return data
+        
+    except requests.exceptions.JSONDecodeError as e:
+        logger.error("Invalid JSON in API response: %s. Error: %s", url, str(e))
+        return None
+        
+    except requests.exceptions.RequestException as e:
+        logger.error("Error fetching data from API: %s. Error: %s", url, str(e))
+        return None
+
+
+def fetch_many_from_api(
+    base_url: str,
+    calls: Sequence[Tuple[str, Optional[Dict[str, str]], Optional[Dict[str, str]]]],
+    timeout: int = 30,
+    min_interval_s: float = 0.0,
+    max_workers: int = 4
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Fetch several endpoints concurrently on the shared session, so the network
+    round trips of independent calls overlap instead of running back to back.
+    
+    Each call goes through fetch_data_from_api on a small thread pool, keeping its
+    retries, pacing and 401/403 re-warm; concurrent callers wait for a single
+    cookie warm-up (see _ensure_warm).
+    
+    Args:
+        base_url: The base URL of the API
+        calls: (endpoint, params, headers) for each request
+        timeout: Request timeout in seconds (default: 30)
+        min_interval_s: Minimum spacing in seconds between requests (default: 0.0)
+        max_workers: Maximum number of requests in flight (default: 4)
     
-    logger.error("Failed to fetch data after %s attempts: %s", max_retries + 1, url)
-    return None
+    Returns:
+        The JSON response of each call, in the order of calls, with None for
+        calls that failed
+    """
+    if not calls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+        futures = [
+            executor.submit(fetch_data_from_api, base_url, endpoint, params, headers, timeout, min_interval_s)
+            for endpoint, params, headers in calls
+        ]
+        return [future.result() for future in futures]
 
 
 def fetch_equity_stock_indices(
-    api_config: Dict[str, Any], 
+    api_config: Mapping[str, Any], 
     index_name: Optional[str] = None
 ) -> Optional[Dict[str, Any]]:
     """
@@ -277,7 +527,7 @@ def fetch_equity_stock_indices(
         NIFTY 50
     """
     # Validate input
-    if not isinstance(api_config, dict):
+    if not isinstance(api_config, Mapping):
         logger.error("Invalid api_config: expected dictionary")
         return None
         
@@ -306,14 +556,14 @@ def fetch_equity_stock_indices(
     return response
 
 
-def fetch_historical_security_archives(
-    api_config: Dict[str, Any],
+def _historical_archives_request(
+    api_config: Mapping[str, Any],
     symbol: str,
     from_date: Optional[str] = None,
     to_date: Optional[str] = None
-) -> Optional[Dict[str, Any]]:
+) -> Optional[Tuple[str, Dict[str, str], Dict[str, str]]]:
     """
-    Fetch historical price data for a specific security.
+    Validate the arguments of a historical archives fetch and build the request.
     
     Args:
         api_config: API configuration dictionary containing endpoints and base URLs
@@ -322,20 +572,14 @@ def fetch_historical_security_archives(
         to_date: End date in DD-MM-YYYY format (defaults to current date)
     
     Returns:
-        Dictionary containing historical price data, or None if the request failed
-        
-    Example:
-        >>> config = load_api_config("config.json")
-        >>> historical_data = fetch_historical_security_archives(config, "TATAMOTORS")
-        >>> print(len(historical_data["data"]))  # Number of days of data
-        252
+        (endpoint, params, headers) for the request, or None if the arguments are invalid
     """
     # Input validation
     if not symbol:
         logger.error("Symbol cannot be empty")
         return None
         
-    if not isinstance(api_config, dict):
+    if not isinstance(api_config, Mapping):
         logger.error("Invalid api_config: expected dictionary")
         return None
     
@@ -389,14 +633,45 @@ def fetch_historical_security_archives(
     
     logger.info("Fetching historical archives for symbol: %s, from: %s, to: %s", 
                 symbol, from_date, to_date)
+    
+    headers = {"Referer": NSE_QUOTE_URL.format(symbol=symbol)}
+    return base_endpoint, params, headers
+
+
+def fetch_historical_security_archives(
+    api_config: Mapping[str, Any],
+    symbol: str,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetch historical price data for a specific security.
+    
+    Args:
+        api_config: API configuration dictionary containing endpoints and base URLs
+        symbol: The stock symbol to fetch data for (e.g., "TATAMOTORS")
+        from_date: Start date in DD-MM-YYYY format (defaults to 1 year ago)
+        to_date: End date in DD-MM-YYYY format (defaults to current date)
+    
+    Returns:
+        Dictionary containing historical price data, or None if the request failed
+        
+    Example:
+        >>> config = load_api_config("config.json")
+        >>> historical_data = fetch_historical_security_archives(config, "TATAMOTORS")
+        >>> print(len(historical_data["data"]))  # Number of days of data
+        252
+    """
+    request = _historical_archives_request(api_config, symbol, from_date, to_date)
+    if request is None:
+        return None
+    endpoint, params, headers = request
                 
     response = fetch_data_from_api(
         api_config['nse_base_url'], 
-        base_endpoint, 
+        endpoint, 
         params=params,
-        headers={
-            "Referer": f"https://www.nseindia.com/get-quotes/equity?symbol={symbol}"
-        }
+        headers=headers
     )
     
     if response is None:
@@ -405,21 +680,66 @@ def fetch_historical_security_archives(
     return response
 
 
+def fetch_many_historical_security_archives(
+    api_config: Mapping[str, Any],
+    symbols: Sequence[str],
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    max_workers: int = 4
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Fetch historical price data for several securities concurrently
+    (see fetch_many_from_api).
+    
+    Args:
+        api_config: API configuration dictionary containing endpoints and base URLs
+        symbols: The stock symbols to fetch data for
+        from_date: Start date in DD-MM-YYYY format (defaults to 1 year ago)
+        to_date: End date in DD-MM-YYYY format (defaults to current date)
+        max_workers: Maximum number of requests in flight (default: 4)
+    
+    Returns:
+        Dictionary mapping each symbol to its historical price data, or None if
+        its request was invalid or failed
+    """
+    results: Dict[str, Optional[Dict[str, Any]]] = {}
+    requested = []
+    calls = []
+    for symbol in symbols:
+        results[symbol] = None
+        request = _historical_archives_request(api_config, symbol, from_date, to_date)
+        if request is not None:
+            requested.append(symbol)
+            calls.append(request)
+    
+    responses = fetch_many_from_api(api_config['nse_base_url'], calls, max_workers=max_workers)
+    for symbol, response in zip(requested, responses):
+        if response is None:
+            logger.warning("Failed to fetch historical archives for symbol: %s", symbol)
+        results[symbol] = response
+    
+    return results
+
+
 def save_json_to_file(
     data: Any, 
     file_path: str, 
-    indent: int = 4,
+    indent: Optional[int] = None,
     ensure_ascii: bool = False
 ) -> bool:
     """
     Save data to a JSON file with error handling.
     
-    Creates necessary directories if they don't exist.
+    Creates necessary directories if they don't exist. The data is written to a
+    temporary file that then replaces file_path, so the file is never seen half
+    written and hard links to the old version keep the old contents. Uses orjson when it is
+    installed and ensure_ascii is off; orjson only indents by 2 spaces, so any
+    non-zero indent is written 2-space indented in that case.
     
     Args:
         data: The data to serialize to JSON and save
         file_path: The path to save the file to
-        indent: Number of spaces for indentation (default: 4)
+        indent: Number of spaces for indentation, or None for compact output (default: None)
         ensure_ascii: Whether to escape non-ASCII characters (default: False)
     
     Returns:
@@ -437,8 +757,21 @@ def save_json_to_file(
             os.makedirs(directory, exist_ok=True)
         
         # Serialize and save the data
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=indent, ensure_ascii=ensure_ascii)
+        tmp_path = f"{file_path}.tmp"
+        try:
+            if orjson is not None and not ensure_ascii:
+                option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+                # orjson.JSONEncodeError subclasses TypeError
+                payload = orjson.dumps(data, option=option)
+                with open(tmp_path, 'wb') as file:
+                    file.write(payload)
+            else:
+                with open(tmp_path, 'w', encoding='utf-8') as file:
+                    json.dump(data, file, indent=indent, ensure_ascii=ensure_ascii)
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
             
         logger.info("Successfully saved JSON data to file: %s", file_path)
         return True
@@ -1,14 +1,26 @@
 import psycopg2
+import psycopg2.pool
 
-def get_db_connection(db_config):
-    """
-    Create a PostgreSQL database connection.
-    """
-    conn = psycopg2.connect(
+def _connect_kwargs(db_config):
+    """Map a db_config dict to psycopg2.connect keyword arguments."""
+    return dict(
         dbname=db_config['dbname'],
         user=db_config['user'],
         password=db_config['password'],
         host=db_config['host'],
         port=db_config['port']
     )
-    return conn
\ No newline at end of file
+
+def get_db_connection(db_config):
+    """
+    Create a PostgreSQL database connection.
+    """
+    conn = psycopg2.connect(**_connect_kwargs(db_config))
+    return conn
+
+def get_db_pool(db_config, minconn=1, maxconn=8):
+    """
+    Create a thread-safe PostgreSQL connection pool, so connections can be borrowed
+    (getconn/putconn) instead of opening a new one per unit of work.
+    """
+    return psycopg2.pool.ThreadedConnectionPool(minconn, maxconn, **_connect_kwargs(db_config))
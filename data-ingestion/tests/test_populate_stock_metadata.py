@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+import importlib
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+
+psm = None
+_tmp_dir = None
+_old_cwd = None
+
+
+def setUpModule():
+    # The script logs to 'populate_stock_metadata.log' in the working directory
+    global psm, _tmp_dir, _old_cwd
+    _tmp_dir = tempfile.TemporaryDirectory()
+    _old_cwd = os.getcwd()
+    os.chdir(_tmp_dir.name)
+    sys.path.insert(0, SCRIPTS_DIR)
+    psm = importlib.import_module("populate_stock_metadata")
+
+
+def tearDownModule():
+    os.chdir(_old_cwd)
+    _tmp_dir.cleanup()
+
+
+PRICES = [
+    {"CH_SYMBOL": "ABC", "CH_TIMESTAMP": "2024-03-05", "CH_CLOSING_PRICE": 10.5},
+    {"CH_SYMBOL": "ABC", "CH_TIMESTAMP": "2023-11-20", "CH_CLOSING_PRICE": 9.8},
+    {"CH_SYMBOL": "ABC", "CH_TIMESTAMP": "2024-01-02", "CH_CLOSING_PRICE": 10.1},
+]
+
+
+class TrustedTimestampScanTest(unittest.TestCase):
+
+    def test_compact_json(self):
+        # The layout save_json_to_file writes
+        buf = json.dumps({"data": PRICES}, separators=(",", ":")).encode()
+        self.assertEqual(psm._min_max_timestamps_trusted(buf), ("2023-11-20", "2024-03-05"))
+
+    def test_indented_json(self):
+        buf = json.dumps(PRICES, indent=2).encode()
+        self.assertEqual(psm._min_max_timestamps_trusted(buf), ("2023-11-20", "2024-03-05"))
+
+    def test_other_layout_falls_back_to_regex(self):
+        buf = b'[{"CH_TIMESTAMP" : "2024-01-02"}, {"CH_TIMESTAMP"  :"2023-05-06"}]'
+        self.assertEqual(psm._min_max_timestamps_trusted(buf), ("2023-05-06", "2024-01-02"))
+
+    def test_compact_file(self):
+        path = os.path.join(_tmp_dir.name, "abc_historical_prices.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"data": PRICES}, f, separators=(",", ":"))
+        self.assertEqual(
+            psm.extract_symbol_dates_from_prices(path, trust_format=True),
+            ("2023-11-20", "2024-03-05")
+        )
+
+
+class UpdateSymbolEntryTest(unittest.TestCase):
+
+    def test_missing_dates_keep_existing_end_date(self):
+        metadata = {
+            "ABC": {"symbol": "ABC", "listing_date": "2010-01-01", "start_date": "2015-01-01", "end_date": "2024-03-05"}
+        }
+        psm.update_or_create_symbol_entry("ABC", "2010-01-01", "", "", metadata)
+        self.assertEqual(metadata["ABC"]["end_date"], "2024-03-05")
+
+    def test_new_dates_replace_end_date(self):
+        metadata = {
+            "ABC": {"symbol": "ABC", "listing_date": "2010-01-01", "start_date": "2015-01-01", "end_date": "2024-03-05"}
+        }
+        psm.update_or_create_symbol_entry("ABC", "2010-01-01", "2015-01-01", "2024-06-28", metadata)
+        self.assertEqual(metadata["ABC"]["end_date"], "2024-06-28")
+
+
+if __name__ == "__main__":
+    unittest.main()